@@ -0,0 +1,201 @@
+"""Measure what building and drawing the dashboard costs, headless.
+
+Builds makeLayout() from the recorded fixtures and renders it to an
+off-screen console at the dashboard's size. Reports time per frame, peak
+memory allocated while drawing it and the bytes a frame writes to the
+terminal.
+
+Run from the repository root:
+    python benchmarks/bench_render.py [--save results.json] [--compare old.json]
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+from importlib import metadata
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import main as dashboard
+from rich.console import Console
+from rich.live import Live
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FRAMES = 200  # Timed frames per scenario
+ALLOC_FRAMES = 20  # Frames traced for allocations, tracemalloc slows everything down
+HELPER_ROUNDS = 20000
+
+
+def loadFixture(name):
+    with open(os.path.join(FIXTURES, f"{name}.json")) as f:
+        return json.load(f)
+
+
+def setUp():
+    """Point the dashboard's state at the fixtures, with full sparklines."""
+    pc = loadFixture("pc")
+    host = dashboard.hosts[next(iter(dashboard.hosts))]
+    host["pc"], host["seq"], host["status"] = pc, 1, True
+    dashboard.pcStatus = True
+    dashboard.selfInfo = loadFixture("selfInfo")
+    dashboard.publishWeather(currentWeather(loadFixture("weather")))
+    for i in range(dashboard.SPARK_LENGTH):
+        tick(i)
+
+
+def currentWeather(data):
+    """Move a recorded forecast to today, so its next hour is found like a fresh one's."""
+    # Whole days, so now falls in the recorded day's second half and the next hour is covered
+    shift = (time.time() - data["location"]["localtime_epoch"]) // 86400 * 86400
+    for day in data["forecast"]["forecastday"]:
+        for hour in day["hour"]:
+            hour["time_epoch"] += shift
+    return data
+
+
+def tick(i):
+    """One second of new data: a new PC snapshot and Pi reading, like the collectors publish."""
+    host = dashboard.hosts[next(iter(dashboard.hosts))]
+    pc = dict(host["pc"])
+    pc["cpu"] = dict(pc["cpu"], percent=(17.4 + i * 7.3) % 100)
+    pc["network"] = dict(pc["network"], recvPerSec=1199020 + (i % 13) * 80000)
+    dashboard.addPcSamples(next(iter(dashboard.hosts)), pc)
+    host["pc"], host["seq"] = pc, host["seq"] + 1
+    dashboard.selfInfo = dict(dashboard.selfInfo, cpuPercent=(23.4 + i * 3.1) % 100)
+    dashboard.addSample("pi", "cpu", dashboard.selfInfo["cpuPercent"], 100)
+
+
+def invalidate(i):
+    """Throw every cached panel away, as if all inputs changed."""
+    tick(i)
+    for panel in dashboard.panels.values():
+        panel.key = object()
+
+
+def idle(i):
+    pass
+
+
+def offscreenConsole():
+    return Console(file=io.StringIO(), width=dashboard.columns, height=dashboard.lines, force_terminal=True, color_system="truecolor")
+
+
+def printFrame(console):
+    """Draw one layout with console.print, returning the bytes written."""
+    console.file.seek(0)
+    console.file.truncate()
+    console.print(dashboard.makeLayout())
+    return len(console.file.getvalue().encode())
+
+
+def liveFrame(live, console):
+    """One explicit refresh of a screen Live, as the dashboard's render loop does."""
+    console.file.seek(0)
+    console.file.truncate()
+    live.update(dashboard.makeLayout(), refresh=True)
+    return len(console.file.getvalue().encode())
+
+
+def measure(step, draw):
+    """Time FRAMES frames, then trace ALLOC_FRAMES more for their peak allocation."""
+    times, sizes = [], []
+    for i in range(FRAMES):
+        step(i)
+        start = time.perf_counter()
+        sizes.append(draw())
+        times.append(time.perf_counter() - start)
+
+    peaks = []
+    tracemalloc.start()
+    for i in range(ALLOC_FRAMES):
+        step(i)
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        draw()
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    times.sort()
+    return {
+        "meanMs": round(statistics.fmean(times) * 1000, 3),
+        "p95Ms": round(times[int(len(times) * 0.95)] * 1000, 3),
+        "peakKb": round(statistics.fmean(peaks) / 1024, 1),
+        "bytes": round(statistics.fmean(sizes)),
+    }
+
+
+def benchHelpers():
+    """Microseconds per call of the formatting helpers used in every cell."""
+    calls = {
+        "floatToColor": lambda: dashboard.floatToColor(57.3, 0, 100, True),
+        "richProgressBar": lambda: dashboard.richProgressBar(57.3, 0, 100, 40),
+        "formatBytes": lambda: dashboard.formatBytes(16240869376),
+        "sparkline": lambda: dashboard.sparkline(next(iter(dashboard.hosts)), "cpu"),
+    }
+    return {name: round(timeit.timeit(call, number=HELPER_ROUNDS) / HELPER_ROUNDS * 1e6, 3) for name, call in calls.items()}
+
+
+def run():
+    setUp()
+    console = offscreenConsole()
+    results = {"frames": {}, "helpersUs": benchHelpers()}
+    for name, step in (("cold", invalidate), ("typical", tick), ("idle", idle)):
+        results["frames"][name] = measure(step, lambda: printFrame(console))
+
+    liveConsole = offscreenConsole()
+    with Live(dashboard.makeLayout(), console=liveConsole, auto_refresh=False, screen=True) as live:
+        results["frames"]["live"] = measure(tick, lambda: liveFrame(live, liveConsole))
+    return results
+
+
+def report(results, baseline=None):
+    """Print results, with the change against baseline when given."""
+    def delta(now, before):
+        if not before:
+            return ""
+        return f" ({(now - before) / before * 100:+.1f}%)"
+
+    old = baseline or {"frames": {}, "helpersUs": {}}
+    print(f"Frames at {dashboard.columns}x{dashboard.lines}:")
+    print(f"  {'scenario':<10} {'mean ms':>18} {'p95 ms':>18} {'peak KB':>18} {'bytes':>18}")
+    for name, frame in results["frames"].items():
+        before = old["frames"].get(name, {})
+        cells = [f"{frame[key]}{delta(frame[key], before.get(key))}" for key in ("meanMs", "p95Ms", "peakKb", "bytes")]
+        print(f"  {name:<10} " + " ".join(f"{cell:>18}" for cell in cells))
+    print("Helpers (us/call):")
+    for name, us in results["helpersUs"].items():
+        print(f"  {name:<16} {us:>8}{delta(us, old['helpersUs'].get(name))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard rendering from fixtures.")
+    parser.add_argument("--save", metavar="FILE", help="Write the results to FILE as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="Show the change against results saved earlier")
+    args = parser.parse_args()
+
+    results = run()
+    results["meta"] = {
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "rich": metadata.version("rich"),
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.compare} ({baseline['meta']['time']})")
+    report(results, baseline)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Measure the dashboard's weather path offline, against weather_stub.py.
+
+Reports what a full fetch, a conditional (304) refresh and a start from the
+disk cache cost, how many requests a burst of simultaneous refreshes sends,
+and the per-frame next-hour lookup.
+
+Run from the repository root:
+    python benchmarks/bench_weather.py [--delay 0.2]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import main as dashboard
+import weather_stub
+
+ROUNDS = 50  # Timed fetches per scenario
+BURST = 8  # Simultaneous refreshes, as on wake-up while the daemon is fetching
+LOOKUP_ROUNDS = 200000
+
+
+def median(call, rounds=ROUNDS):
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+    return round(statistics.median(times) * 1000, 3)
+
+
+def fullFetch():
+    dashboard.weatherCache["etag"] = None
+    dashboard.fetchWeather()
+
+
+def cachedStart():
+    dashboard.weather = {}
+    dashboard.loadWeatherCache()
+
+
+def burst():
+    """Requests the stub sees for BURST refreshes started together."""
+    before = weather_stub.stats["requests"]
+    threads = [threading.Thread(target=dashboard.fetchWeather) for _ in range(BURST)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return weather_stub.stats["requests"] - before
+
+
+def run(delay):
+    server = weather_stub.serve(delay=delay, quiet=True)
+    dashboard.API_URL = f"http://127.0.0.1:{server.server_address[1]}{weather_stub.FORECAST_PATH}?days=2"
+    dashboard.WEATHER_CACHE = os.path.join(tempfile.mkdtemp(), "weather.json")
+
+    results = {
+        "fullFetchMs": median(fullFetch),
+        "conditionalFetchMs": median(dashboard.fetchWeather),
+        "cachedStartMs": median(cachedStart),
+        "burstRequests": burst(),
+    }
+    nextHour = time.time() + 3600
+    forecast = dashboard.weather["forecast"]["forecastday"][0]
+    hour = min(23, time.localtime().tm_hour + 1)
+    results["lookupUs"] = round(timeit.timeit(lambda: dashboard.forecastAt(nextHour), number=LOOKUP_ROUNDS) / LOOKUP_ROUNDS * 1e6, 3)
+    results["nestedLookupUs"] = round(timeit.timeit(lambda: forecast['hour'][hour]['temp_c'], number=LOOKUP_ROUNDS) / LOOKUP_ROUNDS * 1e6, 3)
+    server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the weather fetch and cache path offline.")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds the stub holds back every answer")
+    args = parser.parse_args()
+
+    results = run(args.delay)
+    print(f"Weather path against the local stub (delay {args.delay:g}s):")
+    print(f"  full fetch             {results['fullFetchMs']:>8} ms")
+    print(f"  conditional fetch      {results['conditionalFetchMs']:>8} ms  (304, nothing parsed)")
+    print(f"  start from disk cache  {results['cachedStartMs']:>8} ms")
+    print(f"  {BURST} refreshes at once   {results['burstRequests']:>8} request(s)")
+    print(f"  next hour lookup       {results['lookupUs']:>8} us  (old fixed-day lookup {results['nestedLookupUs']} us)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Compare payload size and decode time of the wire formats.
+
+Run from the repository root: python benchmarks/bench_wire.py
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import wire
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pc.json")
+ROUNDS = 20000
+
+
+def nextSample(pc):
+    """The same snapshot one tick later, only the fast moving values changed."""
+    changed = json.loads(json.dumps(pc))
+    changed["cpu"]["percent"] += 3.1
+    changed["cpu"]["freq"] -= 120.0
+    changed["mem"]["available"] -= 4096 * 37
+    changed["mem"]["used"] += 4096 * 37
+    changed["network"]["sent"] += 18812
+    changed["network"]["recv"] += 1199020
+    changed["network"]["sentPerSec"] = 18812
+    changed["network"]["recvPerSec"] = 1199020
+    changed["gpu"]["percent"] = 29.0
+    changed["processes"]["cpuTop"]["0"]["cpuPer"] = 22.9
+    return changed
+
+
+def bench(label, document, fmt):
+    """Time decoding one encoded document."""
+    body = wire.encode(document, fmt)
+    seconds = timeit.timeit(lambda: wire.decode(body, fmt), number=ROUNDS) / ROUNDS
+    print(f"  {label:<28} {len(body):>6} B  {seconds * 1e6:>8.2f} us/decode")
+
+
+def main():
+    with open(FIXTURE) as f:
+        pc = json.load(f)
+    patch = wire.makePatch(pc, nextSample(pc))
+    dashboard = {name: pc[name] for name in ("cpu", "mem", "network", "gpu", "bootTime", "processes")}
+
+    for fmt in (wire.JSON, wire.MSGPACK):
+        if fmt == wire.MSGPACK and wire.msgpack is None:
+            print(f"{fmt}: skipped, msgpack is not installed")
+            continue
+        print(fmt)
+        bench("full snapshot", pc, fmt)
+        bench("dashboard fields", dashboard, fmt)
+        bench("patch (one tick)", patch, fmt)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""GPU telemetry backends: NVML, GPUtil's nvidia-smi calls, or a fake for machines without a GPU.
+
+Every backend's sample() returns one dict per card, in device order:
+{"index", "name", "memTotal", "memFree", "memUsed", "percent", "temp"}.
+"""
+import math
+
+FAKE_GPUS = 2  # Cards the fake backend reports unless asked for "fake:N"
+FAKE_MEMORY = 8 * 1024 ** 3  # Bytes per fake card
+MIB = 1024 * 1024  # nvidia-smi reports memory in MiB
+
+
+class NvmlBackend:
+    """Direct NVML calls on handles opened once, no subprocess per sample."""
+    name = "nvml"
+
+    def __init__(self):
+        import pynvml  # Optional, pip install nvidia-ml-py
+        pynvml.nvmlInit()
+        self.nvml = pynvml
+        self.handles = [pynvml.nvmlDeviceGetHandleByIndex(i) for i in range(pynvml.nvmlDeviceGetCount())]
+        if not self.handles:
+            pynvml.nvmlShutdown()
+            raise RuntimeError("NVML found no GPU")
+        self.names = [self._text(pynvml.nvmlDeviceGetName(handle)) for handle in self.handles]
+
+    @staticmethod
+    def _text(value):
+        return value.decode() if isinstance(value, bytes) else value
+
+    def _read(self, call, *args):
+        """One NVML reading, None when the card doesn't support it."""
+        try:
+            return call(*args)
+        except self.nvml.NVMLError:
+            return None
+
+    def sample(self):
+        nvml = self.nvml
+        cards = []
+        for index, handle in enumerate(self.handles):
+            memory = self._read(nvml.nvmlDeviceGetMemoryInfo, handle)
+            load = self._read(nvml.nvmlDeviceGetUtilizationRates, handle)
+            temp = self._read(nvml.nvmlDeviceGetTemperature, handle, nvml.NVML_TEMPERATURE_GPU)
+            cards.append({
+                "index": index,
+                "name": self.names[index],
+                "memTotal": memory.total if memory else 0,
+                "memFree": memory.free if memory else 0,
+                "memUsed": memory.used if memory else 0,
+                "percent": float(load.gpu) if load else 0.0,
+                "temp": float(temp) if temp is not None else 0.0
+            })
+        return cards
+
+    def close(self):
+        self.nvml.nvmlShutdown()
+
+
+class GputilBackend:
+    """GPUtil, which runs nvidia-smi for every sample. Slow, but needs no bindings."""
+    name = "gputil"
+
+    def __init__(self):
+        import GPUtil
+        self.gputil = GPUtil
+
+    def sample(self):
+        return [{
+            "index": index,
+            "name": card.name,
+            "memTotal": int(card.memoryTotal * MIB),
+            "memFree": int(card.memoryFree * MIB),
+            "memUsed": int(card.memoryUsed * MIB),
+            "percent": card.load * 100.0,
+            "temp": float(card.temperature)
+        } for index, card in enumerate(self.gputil.getGPUs())]
+
+    def close(self):
+        pass
+
+
+class FakeBackend:
+    """Deterministic cards for machines without a GPU: the nth sample is always the same."""
+    name = "fake"
+
+    def __init__(self, count=FAKE_GPUS):
+        self.count = count
+        self.samples = 0
+
+    def sample(self):
+        n = self.samples
+        self.samples += 1
+        cards = []
+        for index in range(self.count):
+            percent = round(50.0 + 45.0 * math.sin(n / 10 + index), 1)
+            used = int(FAKE_MEMORY * (0.2 + percent / 200))
+            cards.append({
+                "index": index,
+                "name": f"Fake GPU {index}",
+                "memTotal": FAKE_MEMORY,
+                "memFree": FAKE_MEMORY - used,
+                "memUsed": used,
+                "percent": percent,
+                "temp": round(35.0 + percent * 0.4, 1)
+            })
+        return cards
+
+    def close(self):
+        pass
+
+
+class NoBackend:
+    """No usable GPU library, every sample is empty."""
+    name = "none"
+
+    def sample(self):
+        return []
+
+    def close(self):
+        pass
+
+
+def openBackend(kind="auto"):
+    """Open a backend by name: auto, nvml, gputil, fake[:N] or none.
+
+    auto tries NVML first and falls back to GPUtil, then to no GPU at all.
+    """
+    if kind == "auto":
+        for backend in (NvmlBackend, GputilBackend):
+            try:
+                return backend()
+            except Exception as e:
+                print(f"GPU backend {backend.name} unavailable: {e!r}")
+        return NoBackend()
+    if kind == "nvml":
+        return NvmlBackend()
+    if kind == "gputil":
+        return GputilBackend()
+    if kind == "none":
+        return NoBackend()
+    name, _, count = kind.partition(":")
+    if name == "fake":
+        return FakeBackend(int(count) if count else FAKE_GPUS)
+    raise ValueError(f"Unknown GPU backend: {kind}")
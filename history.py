@@ -0,0 +1,152 @@
+"""Bounded in-memory metric history with downsampling, backed by array."""
+import array
+import math
+import threading
+
+NAN = float("nan")
+
+# Numeric metrics kept for every snapshot, name -> (section, key) in the snapshot
+METRICS = {
+    "cpu.percent": ("cpu", "percent"),
+    "cpu.freq": ("cpu", "freq"),
+    "cpu.temp": ("cpu", "temp"),
+    "gpu.percent": ("gpu", "percent"),
+    "gpu.temp": ("gpu", "temp"),
+    "gpu.memUsed": ("gpu", "memUsed"),
+    "mem.percent": ("mem", "percent"),
+    "mem.used": ("mem", "used"),
+    "network.sentPerSec": ("network", "sentPerSec"),
+    "network.recvPerSec": ("network", "recvPerSec"),
+}
+
+
+def metricValues(snapshot):
+    """Pull every known metric out of a snapshot, missing ones are None."""
+    values = {}
+    for name, (section, key) in METRICS.items():
+        value = (snapshot.get(section) or {}).get(key)
+        values[name] = float(value) if isinstance(value, (int, float)) else None
+    return values
+
+
+class History:
+    """Fixed-size ring buffers, one float32 column per metric sharing a timestamp ring.
+
+    Memory is allocated once: 8 bytes per slot for the timestamps plus 4 per
+    slot per metric, so a day at 1s resolution costs a few MB.
+    """
+
+    def __init__(self, capacity, metrics=METRICS):
+        self.capacity = capacity
+        self.times = array.array("d", bytes(8 * capacity))
+        self.columns = {name: array.array("f", bytes(4 * capacity)) for name in metrics}
+        self.head = 0  # Next slot to write
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def append(self, timestamp, values):
+        """Record one sample, overwriting the oldest once full."""
+        with self.lock:
+            slot = self.head
+            self.times[slot] = timestamp
+            for name, column in self.columns.items():
+                value = values.get(name)
+                column[slot] = NAN if value is None else value
+            self.head = (slot + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+    def series(self, metric, start, end):
+        """Chronological (times, values) arrays of one metric for start <= t <= end."""
+        column = self.columns[metric]
+        with self.lock:
+            oldest = (self.head - self.count) % self.capacity
+            lo = self._search(oldest, start, False)
+            hi = self._search(oldest, end, True)
+            return self._slice(self.times, oldest, lo, hi), self._slice(column, oldest, lo, hi)
+
+    def oldest(self):
+        """Timestamp of the oldest sample still held, None while empty."""
+        with self.lock:
+            return self.times[(self.head - self.count) % self.capacity] if self.count else None
+
+    def _search(self, oldest, timestamp, inclusive):
+        """Binary search over the ring in chronological order."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            t = self.times[(oldest + mid) % self.capacity]
+            if t < timestamp or (inclusive and t == timestamp):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _slice(self, data, oldest, lo, hi):
+        """Copy logical positions lo..hi out of the ring, at most two C-level slices."""
+        start = (oldest + lo) % self.capacity
+        length = max(0, hi - lo)
+        if start + length <= self.capacity:
+            return data[start:start + length]
+        return data[start:] + data[:start + length - self.capacity]
+
+
+def minMaxBuckets(times, values, points, maxValues=None):
+    """Downsample to at most points [t, min, max] buckets, skipping missing samples.
+
+    Pre-aggregated data passes its per-record maxima as maxValues.
+    """
+    if maxValues is None:
+        maxValues = values
+    n = len(values)
+    buckets = min(points, n)
+    result = []
+    for bucket in range(buckets):
+        lo = bucket * n // buckets
+        hi = (bucket + 1) * n // buckets
+        low, high = values[lo:hi], maxValues[lo:hi]
+        # sum() stays in C, only buckets with gaps take the slow path
+        if math.isnan(sum(low)):
+            low = [value for value in low if value == value]
+            high = [value for value in high if value == value]
+            if not low:
+                continue
+        result.append([times[lo], round(min(low), 3), round(max(high), 3)])
+    return result
+
+
+def lttb(times, values, points):
+    """Largest-Triangle-Three-Buckets downsampling to at most points [t, v] pairs."""
+    if math.isnan(sum(values)):
+        kept = [i for i, value in enumerate(values) if value == value]
+        times = [times[i] for i in kept]
+        values = [values[i] for i in kept]
+    n = len(values)
+    if points >= n:
+        return [[t, round(v, 3)] for t, v in zip(times, values)]
+    if points < 3:
+        # No bucket between the ends, keep the ends (the latest alone for a single point)
+        ends = [[times[0], round(values[0], 3)], [times[-1], round(values[-1], 3)]]
+        return ends[-points:] if points > 0 else []
+
+    every = (n - 2) / (points - 2)
+    result = [[times[0], round(values[0], 3)]]
+    anchor = 0
+    for bucket in range(points - 2):
+        lo = int(bucket * every) + 1
+        hi = int((bucket + 1) * every) + 1
+        nextLo = hi
+        nextHi = min(int((bucket + 2) * every) + 1, n)
+        avgT = sum(times[nextLo:nextHi]) / (nextHi - nextLo)
+        avgV = sum(values[nextLo:nextHi]) / (nextHi - nextLo)
+
+        anchorT, anchorV = times[anchor], values[anchor]
+        dt, dv = anchorT - avgT, avgV - anchorV
+        best, bestArea = lo, -1.0
+        for i in range(lo, hi):
+            area = abs(dt * (values[i] - anchorV) + (times[i] - anchorT) * dv)
+            if area > bestArea:
+                best, bestArea = i, area
+        result.append([times[best], round(values[best], 3)])
+        anchor = best
+    result.append([times[-1], round(values[-1], 3)])
+    return result
@@ -1,7 +1,13 @@
 import requests
-import pyfiglet
+from requests.adapters import HTTPAdapter
 import subprocess
 import threading
+import collections
+import argparse
+import gzip
+import atexit
+import signal
+import json
 import shutil
 import time
 import psutil
@@ -16,31 +22,96 @@ from rich.align import Align
 from rich.console import Group
 from rich.progress import Progress, BarColumn, TextColumn
 from rich.text import Text
+from rich.measure import Measurement
+from rich.segment import Segment
 from rich import box
 from io import StringIO
+import wire
+
+try:
+    import store, history  # Only needed with STORE_DIR
+except ImportError:
+    store = history = None
 
 columns = 210  # Fixed for terminal size
 lines = 65
 console = Console(force_terminal=True, color_system="truecolor", width=columns)
 
-PC_URL = "http://192.168.1.164:5000" # Change to PC's IP (use 'ip a' to find)
+PC_HOSTS = {
+    "PC": "http://192.168.1.164:5000", # Change to PC's IP (use 'ip a' to find), add a line per machine
+}
+HOST_VIEW = "rotate" # With several PCs: "rotate" shows one at a time, "grid" a summary row for each
+ROTATE_SECONDS = 10 # Seconds each PC stays on screen
+PC_FIELDS = "cpu,mem,network,gpu,bootTime,processes" # Only what the dashboard shows
+CONNECT_TIMEOUT = 2 # Seconds to establish a connection to the PC or the weather API
+STREAM_TIMEOUT = 5 # Seconds without a snapshot or heartbeat before the stream counts as dead
+WEATHER_TIMEOUT = 10 # Seconds to wait for the weather API to answer
+WEATHER_TTL = 650 # Seconds a forecast stays fresh, also across restarts through WEATHER_CACHE
+MAX_BACKOFF = 30 # Upper bound for the reconnect delay in seconds
+MAX_FPS = 2 # Upper bound on redraws per second, bursts of updates are drawn as one frame
+RECORD_FLUSH = 5 # Seconds between flushes of a --record log, the most a crash can lose
+SPARK_LENGTH = 20 # Samples shown in each sparkline, one per update
+SPARK_CHARS = "▁▂▃▄▅▆▇█" # Sparkline levels from low to high, " .:-=+*#" for fonts without block glyphs
+SELF_INTERVAL = 1 # Seconds between readings of the Pi's own CPU, memory and temperature
+THERMAL_ZONE = "/sys/class/thermal/thermal_zone0/temp" # Pi SoC temperature in millidegrees C
+STORE_DIR = None # Directory to keep metric history on disk (needs store.py and history.py), None to disable
+FAST_START = False # Skip the intro animations and pauses, --fast-start sets it
+WEATHER_CACHE = os.path.expanduser("~/.cache/richmonitor/weather.json") # Last forecast and when it was fetched, shown at once on start
+SYSTEMS = ["systemd", "sshd", "cron", "python3", "NetworkManager", "dnsmasq"] # Process names watched, add any other systems
+SYSTEMD_UNITS = [] # systemd units whose state is shown too, e.g. ["ssh.service", "pc-monitor.service"], queried in one systemctl call
+SERVICE_INTERVAL = 10 # Seconds between service scans
 API_KEY = "CHANGE ME" # Set to weatherapi API key
 LOC = "CHANGE ME" # Set to Zip code or city
 API_URL = f"https://api.weatherapi.com/v1/forecast.json?key={API_KEY}&q={LOC}&days=2&aqi=no&alerts=yes"
 
-# Global states
-pcStatus = False
-pc = {}
+# Global states, collectors swap in new objects rather than mutating them and then call publish()
+stateCond = threading.Condition() # Notified on every publish, guards multi-field updates
+stateVersion = 0 # Bumped by every publish, the render loop redraws when it moves
+drawnVersion = 0 # Last version the render loop drew, max speed replays wait for it
+recorder = None # Open --record log
+pcStatus = False # True while at least one PC is online
+hosts = {name: {"url": url, "pc": {}, "status": None, "seq": None} for name, url in PC_HOSTS.items()} # status is None until the first connection attempt ends
 selfInfo = {
     "cpuPercent": 0.0,
     "memUsed": 0,
     "memTotal": 0,
     "memPercent": 0.0,
     "cpuTemp": 0.0,
+    "cpuCores": [],
     "upTime": 0
 }
 weather = {}
+weatherHours = (0, {}) # Hour index of the forecast from indexHours(), swapped in with it
+weatherCache = {"fetched": 0.0, "etag": None, "lastModified": None} # When the forecast was fetched and its validators
+weatherLock = threading.Lock()
+weatherInFlight = None # Event set when the fetch under way finishes
+services = {} # Watched process or unit -> "running", "stopped" or the unit's state
+hostStores = {} # PC name -> MetricStore when STORE_DIR is set
+piStore = None
+PI_METRICS = ["cpuPercent", "cpuTemp", "memPercent", "memUsed"] # selfInfo keys kept on disk
+trends = {} # (source, metric) -> recent samples and their cached sparkline
+PC_TRENDS = { # Sparkline name -> (section, key, full scale or None to scale to the peak)
+    "cpu": ("cpu", "percent", 100),
+    "cpuTemp": ("cpu", "temp", 100),
+    "gpu": ("gpu", "percent", 100),
+    "mem": ("mem", "percent", 100),
+    "recv": ("network", "recvPerSec", None),
+    "sent": ("network", "sentPerSec", None),
+}
+startupSeconds = {} # "launch"/"wake" -> seconds until the first frame was drawn
 stopEvent = threading.Event()
+drawingEvent = threading.Event() # Set once the dashboard is on screen, replays start their clock then
+
+
+def makeSession():
+    """Pooled keep-alive HTTP session, gzip/zstd responses are decoded transparently."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=2, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+session = makeSession()
 
 def richProgressBar(value: float, min_val: float, max_val: float, width: int = 50) -> str:
     """Simple ASCII progress bar."""
@@ -74,31 +145,79 @@ def hdmiPower(state: bool):
     subprocess.run(cmd, shell=True, check=True)
 
 
+def runningNames():
+    """Names of all running processes, in one pass over /proc instead of a pidof per name."""
+    names = set()
+    try:
+        pids = [pid for pid in os.listdir("/proc") if pid.isdigit()]
+    except FileNotFoundError:
+        return {proc.info["name"] for proc in psutil.process_iter(["name"])}
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/comm", "rb") as f:
+                names.add(f.read().decode(errors="replace").rstrip("\n"))
+        except OSError:
+            pass # Exited while scanning
+    return names
+
+
+def unitStates(units):
+    """ActiveState (with SubState) of every unit from a single systemctl call, empty without systemd."""
+    if not units:
+        return {}
+    try:
+        result = subprocess.run(
+            ["systemctl", "show", "--property=Id,Names,ActiveState,SubState", "--", *units],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=5
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return {}
+    # One block of key=value lines per unit, matched by the names it goes by (Id, aliases)
+    byName = {}
+    for block in result.stdout.split("\n\n"):
+        fields = dict(line.partition("=")[::2] for line in block.splitlines())
+        state, sub = fields.get("ActiveState", "unknown"), fields.get("SubState", "")
+        for name in {fields.get("Id", ""), *fields.get("Names", "").split()} - {""}:
+            byName[name] = f"{state} ({sub})" if sub and sub != state else state
+    states = {}
+    for unit in units:
+        # systemctl takes "nginx" for "nginx.service"
+        states[unit] = byName.get(unit) or byName.get(unit + ".service", "unknown")
+    return states
+
+
+watchedNames = {name[:15]: name for name in SYSTEMS} # comm is cut to 15 characters
+
+def scanServices():
+    """State of every watched process and unit: one /proc pass and at most one systemctl call."""
+    running = {watchedNames[name] for name in runningNames() if name in watchedNames}
+    states = {name: "running" if name in running else "stopped" for name in SYSTEMS}
+    states.update(unitStates(SYSTEMD_UNITS))
+    return states
+
+
 def checkSystem():
     """Check system services and return status summary."""
     output = {"okay": 0, "fail": 0, "total": 0}
-
-    # Add any other systems
-    systems = ["systemd", "sshd", "cron", "python3", "NetworkManager", "dnsmasq"]
+    states = scanServices()
     
     print("\n+===================================================+")
     print("|           SYSTEM SERVICE STATUS CHECK             |")
     print("+===================================================+\n")
     
-    for proc in systems:
-        result = subprocess.run(
-            ["pidof", proc],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL
-        )
-        if result.returncode == 0:
+    for proc, state in states.items():
+        if state == "running" or state.startswith("active"):
             print(f"  \033[32m[OK]\033[0m {proc:<30} \033[32m[ONLINE]\033[0m")
             output["okay"] += 1
         else:
             print(f"  \033[31m[XX]\033[0m {proc:<30} \033[31m[OFFLINE]\033[0m")
             output["fail"] += 1
         output["total"] += 1
-        time.sleep(0.15)
+        if not FAST_START:
+            time.sleep(0.15)
     
     print("\n" + "-" * 53)
     if output['fail'] > 0:
@@ -108,6 +227,12 @@ def checkSystem():
     print("-" * 53 + "\n")
 
 
+def figlet(text):
+    """Big banner text, pyfiglet is only imported for the animations."""
+    import pyfiglet
+    return pyfiglet.figlet_format(text, width=columns, font="computer", justify="center")
+
+
 def textType(text, delay):
     """Type out text character by character with delay."""
     for ch in text:
@@ -150,63 +275,455 @@ def floatToColor(value: float, minVal: float, maxVal: float, isPercent=False) ->
         return f"[{color}]{formattedValue}[/]"
 
 
-def pcCollector():
-    """Daemon for collecting PC's metrics."""
-    global pc, pcStatus
+def publish():
+    """Bump the state version and wake the render loop."""
+    global stateVersion
+    with stateCond:
+        stateVersion += 1
+        stateCond.notify_all()
+
+
+def setHostStatus(name, status):
+    """Update a PC's status and the overall online flag."""
+    global pcStatus
+    host = hosts[name]
+    with stateCond:
+        changed = host["status"] != status
+        host["status"] = status
+        pcStatus = any(h["status"] for h in hosts.values())
+    if changed:
+        record("status", name, status)
+        publish()
+
+
+def publishHost(name, document, eventId):
+    """Swap in a PC's new snapshot, from its server or a replay."""
+    host = hosts[name]
+    changed = document != host["pc"]
+    addPcSamples(name, document)
+    with stateCond:
+        host["pc"], host["seq"] = document, eventId
+        setHostStatus(name, True)
+    if changed:
+        record("pc", name, document)
+        publish()
+
+
+def publishSelfInfo(info):
+    """Swap in a new reading of the Pi's own metrics."""
+    global selfInfo
+    addSample("pi", "cpu", info["cpuPercent"], 100)
+    addSample("pi", "temp", info["cpuTemp"], 100)
+    addSample("pi", "mem", info["memPercent"], 100)
+    if info != selfInfo:
+        selfInfo = info
+        record("self", "pi", info)
+        publish()
+
+
+def indexHours(data):
+    """(offset, hours) of a forecast: hourly entries keyed by the hour they start in.
+
+    The next hour is then one lookup in forecastAt(), and it runs on into
+    tomorrow's entries at 23:xx.
+    """
+    forecast = data.get("forecast") or {}
+    hours = [hour for day in forecast.get("forecastday", []) for hour in day.get("hour", [])]
+    # Locations on half-hour time zones start their hours off the UTC hour
+    offset = hours[0]["time_epoch"] % 3600 if hours else 0
+    return offset, {(hour["time_epoch"] - offset) // 3600: hour for hour in hours}
+
+
+def forecastAt(timestamp):
+    """Forecast for the hour containing timestamp, None outside the forecast."""
+    offset, hours = weatherHours
+    return hours.get((int(timestamp) - offset) // 3600)
+
+
+def publishWeather(data):
+    """Swap in a new weather forecast."""
+    global weather, weatherHours
+    weatherHours = indexHours(data)
+    weather = data
+    record("weather", "api", data)
+    publish()
+
+
+def publishServices(states):
+    """Swap in new service states, only redrawing when one changed."""
+    global services
+    if states != services:
+        services = states
+        record("services", "pi", states)
+        publish()
+
+
+def startRecording(path):
+    """Log every published state change to path as gzipped JSON lines."""
+    global recorder
+    start = time.time()
+    logFile = gzip.open(path, "wt", encoding="utf-8")
+    logFile.write(json.dumps({"version": 1, "start": start, "hosts": list(hosts)}) + "\n")
+    recorder = {"file": logFile, "start": start, "documents": {}, "flushed": time.monotonic(), "lock": threading.Lock()}
+    # A log closed without its gzip trailer can't be replayed to the end
+    atexit.register(stopRecording)
+
+
+def record(kind, name, value):
+    """Append [seconds, kind, name, value] to the record log; documents are stored as patches."""
+    log = recorder
+    if log is None:
+        return
+    with log["lock"]:
+        if log["file"].closed:
+            return # Stopped while this change was being published
+        if isinstance(value, dict):
+            previous = log["documents"].get((kind, name), {})
+            log["documents"][(kind, name)] = value
+            value = wire.makePatch(previous, value)
+        line = [round(time.time() - log["start"], 3), kind, name, value]
+        log["file"].write(json.dumps(line, separators=(",", ":")) + "\n")
+        if time.monotonic() - log["flushed"] >= RECORD_FLUSH:
+            log["file"].flush()
+            log["flushed"] = time.monotonic()
+
+
+def stopRecording():
+    """Close the record log, safe to call more than once."""
+    global recorder
+    log, recorder = recorder, None
+    if log is not None:
+        with log["lock"]:
+            log["file"].close()
+
+
+def startReplay(path, speed):
+    """Replace the configured PCs with the recorded ones and start feeding the log back."""
+    logFile = gzip.open(path, "rt", encoding="utf-8")
+    header = json.loads(logFile.readline())
+    with stateCond:
+        hosts.clear()
+        for name in header["hosts"]:
+            hosts[name] = {"url": None, "pc": {}, "status": None, "seq": None}
+    thread = threading.Thread(target=replayDaemon, args=(logFile, speed), daemon=True)
+    thread.start()
+    return thread
+
+
+def logLines(logFile):
+    """Parsed lines of a record log, ending quietly where a crash cut it short.
+
+    A recorder killed mid-write leaves a gzip stream without its trailer and
+    possibly half a line, so the log ends at its last complete line.
+    """
+    try:
+        for line in logFile:
+            seconds, kind, name, value = json.loads(line)
+            yield seconds, kind, name, value
+    except (EOFError, OSError, ValueError):
+        return
+
+
+def replayDaemon(logFile, speed):
+    """Daemon publishing a record log through the same path as the live collectors.
+
+    speed scales the recorded timing; 0 publishes each change as soon as the
+    previous one has been drawn, one frame per change.
+    """
+    documents = {}
+    drawingEvent.wait()
+    started = time.monotonic()
+    with logFile:
+        for lineNumber, (seconds, kind, name, value) in enumerate(logLines(logFile)):
+            if speed > 0:
+                stopEvent.wait(max(0.0, started + seconds / speed - time.monotonic()))
+            else:
+                with stateCond:
+                    # While every PC is offline the render loop sleeps instead of drawing
+                    stateCond.wait_for(lambda: drawnVersion >= stateVersion or not pcStatus or stopEvent.is_set())
+            if stopEvent.is_set():
+                return
+            if kind == "status":
+                setHostStatus(name, value)
+                continue
+            document = documents[(kind, name)] = wire.applyPatch(documents.get((kind, name), {}), value)
+            if kind == "pc":
+                publishHost(name, document, lineNumber)
+            elif kind == "self":
+                publishSelfInfo(document)
+            elif kind == "weather":
+                publishWeather(document)
+            elif kind == "services":
+                publishServices(document)
+
+
+def addSample(source, metric, value, top=None):
+    """Append a sample to a metric's ring buffer in O(1), invalidating its sparkline."""
+    trend = trends.get((source, metric))
+    if trend is None:
+        trend = trends[(source, metric)] = {"samples": collections.deque(maxlen=SPARK_LENGTH), "top": top, "count": 0, "built": -1, "line": ""}
+    trend["samples"].append(value or 0.0)
+    trend["count"] += 1
+
+
+def addPcSamples(name, pc):
+    """Feed one PC snapshot into its sparklines."""
+    for metric, (section, key, top) in PC_TRENDS.items():
+        addSample(name, metric, (pc.get(section) or {}).get(key), top)
+
+
+def sparkline(source, metric):
+    """Sparkline of a metric's recent samples, only rebuilt after a new sample."""
+    trend = trends.get((source, metric))
+    if trend is None:
+        return " " * SPARK_LENGTH
+    if trend["built"] != trend["count"]:
+        count = trend["count"]
+        samples = list(trend["samples"]) # One C-level copy, collectors append concurrently
+        top = trend["top"] or max(samples) or 1.0
+        levels = len(SPARK_CHARS) - 1
+        line = "".join(SPARK_CHARS[max(0, min(levels, round(value / top * levels)))] for value in samples)
+        trend["line"], trend["built"] = line.rjust(SPARK_LENGTH), count
+    return trend["line"]
+
+
+def coreBars(perCore):
+    """One sparkline level per core, so a single saturated thread stands out."""
+    levels = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[round(min(100.0, usage or 0.0) / 100 * levels)] for usage in perCore)
+
+
+def openStores():
+    """Open the on-disk metric stores for every PC and the Pi."""
+    global piStore
+    if not STORE_DIR:
+        return
+    if store is None:
+        print("    \033[33m[!]\033[0m STORE_DIR is set but store.py/history.py are missing")
+        return
+    for name in hosts:
+        hostStores[name] = store.MetricStore(os.path.join(STORE_DIR, name), history.METRICS)
+    piStore = store.MetricStore(os.path.join(STORE_DIR, "pi"), PI_METRICS)
+
+
+def pcCollector(name):
+    """Daemon for collecting one PC's metrics from the server's event stream."""
+    host = hosts[name]
+    # Each PC gets its own connection pool so a slow one can't hold up the others
+    hostSession = makeSession()
     
+    backoff = 1
     while not stopEvent.is_set():
-        try: 
-            response = requests.get(PC_URL, timeout=2)
-            pc = response.json()
-            pcStatus = True
+        try:
+            # Resumes from the last snapshot so the server can answer with a patch
+            params = {"fields": PC_FIELDS}
+            for eventId, document in wire.followStream(hostSession, host["url"], host["seq"], host["pc"], params=params, timeout=(CONNECT_TIMEOUT, STREAM_TIMEOUT)):
+                publishHost(name, document, eventId)
+                if name in hostStores:
+                    hostStores[name].append(time.time(), history.metricValues(document))
+                backoff = 1
+                if stopEvent.is_set():
+                    break
         except (requests.RequestException, ValueError):
-            pcStatus = False
-        time.sleep(1)
+            pass
+        setHostStatus(name, False)
+        # Reconnect with exponential backoff
+        stopEvent.wait(backoff)
+        backoff = min(backoff * 2, MAX_BACKOFF)
+
+
+class ProcStats:
+    """The Pi's own CPU, memory and temperature, read straight from /proc.
+
+    The files are opened once and re-read from the start with os.pread, CPU
+    usage is the change in /proc/stat jiffies since the previous read, so a
+    reading never sleeps, and boot time is only looked up once.
+    """
+
+    def __init__(self):
+        self.stat = os.open("/proc/stat", os.O_RDONLY)
+        self.meminfo = os.open("/proc/meminfo", os.O_RDONLY)
+        try:
+            self.thermal = os.open(THERMAL_ZONE, os.O_RDONLY)
+        except OSError:
+            self.thermal = None
+        self.bootTime = psutil.boot_time()
+        self.last = self.cpuTimes()
+
+    def cpuTimes(self):
+        """(busy, total) jiffies of all CPUs and then each core, from the cpu lines at the top of /proc/stat."""
+        times = []
+        for line in os.pread(self.stat, 4096, 0).split(b"\n"):
+            if not line.startswith(b"cpu"):
+                break
+            # user nice system idle iowait irq softirq steal, guest time is already in user
+            values = [int(value) for value in line.split()[1:9]]
+            total = sum(values)
+            times.append((total - values[3] - values[4], total))
+        return times
+
+    def read(self, info):
+        """Fill in info with usage since the previous read."""
+        times = self.cpuTimes()
+        usage = []
+        for (busy, total), (lastBusy, lastTotal) in zip(times, self.last):
+            usage.append(round((busy - lastBusy) / (total - lastTotal) * 100, 1) if total > lastTotal else 0.0)
+        self.last = times
+        info["cpuPercent"] = usage[0]
+        info["cpuCores"] = usage[1:]
+
+        # MemTotal and MemAvailable are the first and third lines
+        memory = {}
+        for line in os.pread(self.meminfo, 256, 0).split(b"\n")[:3]:
+            key, _, value = line.partition(b":")
+            memory[key] = int(value.split()[0]) * 1024
+        total, available = memory[b"MemTotal"], memory[b"MemAvailable"]
+        info["memTotal"] = total
+        info["memUsed"] = total - available
+        info["memPercent"] = round((total - available) / total * 100, 1)
+
+        if self.thermal is not None:
+            info["cpuTemp"] = int(os.pread(self.thermal, 16, 0)) / 1000
+        info["upTime"] = self.bootTime
 
 
 def selfCollector():
     """Daemon for collecting Raspberry Pi's metrics."""
     global selfInfo
+    try:
+        stats = ProcStats()
+    except OSError:
+        stats = None # Not Linux, psutil measures CPU usage by sleeping SELF_INTERVAL instead
     
     while not stopEvent.is_set():
+        info = dict(selfInfo) # Filled in and swapped in whole, the render loop may be reading the old one
         try:
-            mem = psutil.virtual_memory()
-            selfInfo["cpuPercent"] = psutil.cpu_percent(interval=1)
-            selfInfo["memUsed"] = mem.used
-            selfInfo["memTotal"] = mem.total
-            selfInfo["memPercent"] = mem.percent
-            selfInfo["cpuTemp"] = psutil.sensors_temperatures()['cpu_thermal'][0].current
-            selfInfo["upTime"] = psutil.boot_time()
-        except (KeyError, IndexError):
+            if stats is not None:
+                stopEvent.wait(SELF_INTERVAL)
+                stats.read(info)
+            else:
+                mem = psutil.virtual_memory()
+                info["cpuPercent"] = psutil.cpu_percent(interval=SELF_INTERVAL)
+                info["memUsed"] = mem.used
+                info["memTotal"] = mem.total
+                info["memPercent"] = mem.percent
+                info["cpuTemp"] = psutil.sensors_temperatures()['cpu_thermal'][0].current
+                info["upTime"] = psutil.boot_time()
+            if piStore is not None:
+                piStore.append(time.time(), info)
+        except (KeyError, IndexError, ValueError, OSError):
             pass
+        publishSelfInfo(info)
+
+
+def weatherAge():
+    """Seconds since the forecast was fetched, infinite when stale.
+
+    A fetch time in the future means the clock stepped back (a Pi without an
+    RTC before NTP), so such a forecast counts as stale too.
+    """
+    age = time.time() - weatherCache["fetched"]
+    return age if 0 <= age < WEATHER_TTL else float("inf")
 
 
 def weatherCollector():
-    """Daemon for collecting weather data."""
-    global weather
-    
+    """Daemon for refreshing the weather whenever the cached forecast is older than WEATHER_TTL."""
     while not stopEvent.is_set():
-        try:
-            response = requests.get(API_URL, timeout=10)
+        if weatherAge() >= WEATHER_TTL:
+            fetchWeather()
+        # Failed fetches are retried a TTL later
+        age = weatherAge()
+        stopEvent.wait(WEATHER_TTL - age if age < WEATHER_TTL else WEATHER_TTL)
+
+
+def fetchWeather():
+    """Fetch the forecast, or wait for the fetch already under way instead of starting another.
+
+    The validators of the last response are sent along, so an unchanged
+    forecast costs a 304 and no parsing.
+    """
+    global weatherInFlight
+    with weatherLock:
+        inFlight = weatherInFlight
+        leader = inFlight is None
+        if leader:
+            inFlight = weatherInFlight = threading.Event()
+    if not leader:
+        inFlight.wait(CONNECT_TIMEOUT + WEATHER_TIMEOUT)
+        return
+    
+    try:
+        headers = {}
+        if weather and weatherCache["etag"]:
+            headers["If-None-Match"] = weatherCache["etag"]
+        if weather and weatherCache["lastModified"]:
+            headers["If-Modified-Since"] = weatherCache["lastModified"]
+        response = session.get(API_URL, headers=headers, timeout=(CONNECT_TIMEOUT, WEATHER_TIMEOUT))
+        if response.status_code == 304 and weather:
+            weatherCache["fetched"] = time.time()
+        else:
             response.raise_for_status()
             data = response.json()
-            if isinstance(data, dict):
-                weather = data
-        except (requests.RequestException, ValueError) as e:
-            pass
-        time.sleep(650)
+            if not isinstance(data, dict):
+                return
+            weatherCache.update(fetched=time.time(), etag=response.headers.get("ETag"), lastModified=response.headers.get("Last-Modified"))
+            publishWeather(data)
+        saveWeatherCache()
+    except (requests.RequestException, ValueError):
+        pass
+    finally:
+        with weatherLock:
+            weatherInFlight = None
+        inFlight.set()
+
+
+def serviceCollector():
+    """Daemon for watching services."""
+    while not stopEvent.is_set():
+        publishServices(scanServices())
+        stopEvent.wait(SERVICE_INTERVAL)
+
+
+def loadWeatherCache():
+    """Show the last forecast saved, so the first frame has weather without waiting for the API.
+
+    A forecast younger than WEATHER_TTL isn't fetched again until it expires.
+    """
+    try:
+        with open(WEATHER_CACHE) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return
+    if not isinstance(cached, dict) or not isinstance(cached.get("data"), dict) or weather:
+        return
+    for key in weatherCache:
+        weatherCache[key] = cached.get(key, weatherCache[key])
+    publishWeather(cached["data"])
+
+
+def saveWeatherCache():
+    """Keep the forecast and its fetch time for the next start, replaced whole so a crash never leaves half a file."""
+    try:
+        os.makedirs(os.path.dirname(WEATHER_CACHE), exist_ok=True)
+        with open(WEATHER_CACHE + ".tmp", "w") as f:
+            json.dump(dict(weatherCache, data=weather), f)
+        os.replace(WEATHER_CACHE + ".tmp", WEATHER_CACHE)
+    except OSError:
+        pass
 
 
 def startUp():
-    """Startup sequence."""
-    global weather
+    """Startup sequence, only the service check with FAST_START."""
     os.system("clear")
+    if FAST_START:
+        checkSystem()
+        return
     
     # Animated border
     print("\n\033[36m" + "=" * columns + "\033[0m")
 
     # Change 'Welcome back' to anything you want
-    textType(pyfiglet.figlet_format("Welcome back", width=columns, font="computer", justify="center"), 0.003)
+    textType(figlet("Welcome back"), 0.003)
     print("\033[36m" + "=" * columns + "\033[0m\n")
     
     time.sleep(2)
@@ -225,25 +742,22 @@ def startUp():
         time.sleep(0.3)
         print(".", end="", flush=True)
     print("\n")
-    try:
-        response = requests.get(API_URL, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        if isinstance(data, dict):
-            weather = data
-    except (requests.RequestException, ValueError) as e:
-        pass
     time.sleep(0.5)
     os.system("clear")
 
 
+def terminate(signum, frame):
+    """SIGTERM handler, running the same graceful shutdown as Ctrl+C."""
+    raise KeyboardInterrupt
+
+
 def goodbye():
     """Goodbye sequence."""
     os.system("clear")
     print("\n\033[36m" + "=" * columns + "\033[0m")
 
     # Same with 'Goodbye'
-    textType(pyfiglet.figlet_format("Goodbye", width=columns, font="computer", justify="center"), 0.003)
+    textType(figlet("Goodbye"), 0.003)
     print("\033[36m" + "=" * columns + "\033[0m\n\n")
     time.sleep(1)
     textType("  > Entering sleep mode in ", 0.05)
@@ -253,21 +767,27 @@ def goodbye():
 
 
 def periodicUpdate():
-    """Handle PC disconnect/reconnect sequence."""
+    """Handle PC disconnect/reconnect sequence, returns when the PC came back."""
     global pcStatus
     
-    goodbye()
-    time.sleep(0.1)
+    if not FAST_START:
+        goodbye()
+        time.sleep(0.1)
     os.system("clear")
     hdmiPower(False)
     
-    while not pcStatus and not stopEvent.is_set():
-        time.sleep(1)
+    with stateCond:
+        stateCond.wait_for(lambda: pcStatus or stopEvent.is_set())
     
+    wokeAt = time.monotonic()
+    if weatherAge() >= WEATHER_TTL:
+        threading.Thread(target=fetchWeather, daemon=True).start()
     hdmiPower(True)
-    time.sleep(5)
+    if not FAST_START:
+        time.sleep(5)
     os.system("clear")
     startUp()
+    return wokeAt
 
 def formatUptime(seconds: float) -> str:
     """Format uptime in HH:MM format."""
@@ -276,26 +796,93 @@ def formatUptime(seconds: float) -> str:
     return f"{hours:02d}:{minutes:02d}"
 
 
-def makeLayout():
-    """Generate dashboard layout."""
-    global pc, pcStatus, selfInfo, weather
-    
-    layout = Layout()
-    layout.split_column(
-        Layout(name="banner", size=7),
-        Layout(name="body"),
+def currentHost():
+    """Name of the PC on screen, rotating through the online ones."""
+    online = [name for name, host in hosts.items() if host["status"]] or list(hosts)
+    return online[int(time.time() // ROTATE_SECONDS) % len(online)]
+
+
+def makeHostGrid():
+    """Compact summary table with a row per PC."""
+    grid = Table(
+        title="PCs",
+        expand=True,
+        box=box.ROUNDED,
+        border_style="bright_blue",
+        padding=(0, 1)
     )
+    grid.add_column("Host", justify="left", ratio=3, style="bright_white", no_wrap=True)
+    grid.add_column("Status", justify="center", ratio=3, no_wrap=True)
+    grid.add_column("CPU%", justify="left", ratio=4, no_wrap=True)
+    grid.add_column("Temp", justify="right", ratio=2, no_wrap=True)
+    grid.add_column("GPU%", justify="right", ratio=2, no_wrap=True)
+    grid.add_column("RAM%", justify="left", ratio=4, no_wrap=True)
+    grid.add_column("Down", justify="right", ratio=3, style="bright_green", no_wrap=True)
+    grid.add_column("Up", justify="right", ratio=3, style="bright_blue", no_wrap=True)
     
-    now = time.time()
-    localTime = time.localtime(now)
-    
-    hourInAmPm = time.strftime("%I:%M %p", localTime)
-    dayWeek = time.strftime("%A", localTime)
-    month = time.strftime("%B %d, %Y", localTime)
-    
-    # Enhanced banner with status indicator
-    statusIndicator = "[green]ONLINE[/]" if pcStatus else "[red]OFFLINE[/]"
-    
+    for name, host in hosts.items():
+        pc = host["pc"]
+        if host["status"] and pc:
+            grid.add_row(
+                name,
+                "[green]ONLINE[/]",
+                f"{floatToColor(pc['cpu']['percent'], 0, 100, True)} {richProgressBar(pc['cpu']['percent'], 0, 100, 8)}",
+                f"{floatToColor(pc['cpu'].get('temp') or 0.0, 0, 100)}C",
+                floatToColor(pc['gpu']['percent'], 0, 100, True),
+                f"{floatToColor(pc['mem']['percent'], 0, 100, True)} {richProgressBar(pc['mem']['percent'], 0, 100, 8)}",
+                f"{formatBytes(pc['network']['recvPerSec'])}/s",
+                f"{formatBytes(pc['network']['sentPerSec'])}/s",
+            )
+        else:
+            grid.add_row(name, "[red]OFFLINE[/]", "", "", "", "", "", "")
+    return grid
+
+
+class CachedPanel:
+    """Persistent renderable that rebuilds only when its inputs change.
+
+    The built renderable is rendered once per size and its lines are replayed
+    on every following frame, so an unchanged panel costs no markup parsing
+    or table layout.
+    """
+
+    def __init__(self):
+        self.key = object() # Equal to no real key, the first update always builds
+        self.renderable = None
+        self.lines = {} # (width, height) -> rendered lines
+        self.measurements = {} # width -> Measurement
+
+    def update(self, key, build):
+        """Rebuild through build() when key differs from the inputs of the last build."""
+        if key != self.key:
+            self.key, self.renderable = key, build()
+            self.lines.clear()
+            self.measurements.clear()
+        return self
+
+    def __rich_measure__(self, console, options):
+        measurement = self.measurements.get(options.max_width)
+        if measurement is None:
+            measurement = self.measurements[options.max_width] = Measurement.get(console, options, self.renderable)
+        return measurement
+
+    def __rich_console__(self, console, options):
+        size = (options.max_width, options.height)
+        lines = self.lines.get(size)
+        if lines is None:
+            lines = self.lines[size] = console.render_lines(self.renderable, options)
+        newLine = Segment.line()
+        for line in lines:
+            yield from line
+            yield newLine
+
+
+panels = {name: CachedPanel() for name in ("banner", "pc", "pi", "cpuTop", "memTop", "weather", "services")}
+dashboard = None # Persistent Layout holding the panels, built on the first frame
+
+
+def makeBanner(hourInAmPm, dayWeek, month, statusIndicator):
+    """Clock and connection status banner."""
     bannerLines = [
         f"[bright_cyan]{hourInAmPm}[/]",
         "",
@@ -305,61 +892,71 @@ def makeLayout():
     ]
     bannerText = "\n".join(bannerLines)
     
-    layout["banner"].update(
-        Panel(
-            Align.center(bannerText, vertical="middle"),
-            title="[bright_cyan]SYSTEM DASHBOARD[/]",
-            border_style="bright_cyan",
-            padding=(0, 2),
-            box=box.ROUNDED
-        )
+    return Panel(
+        Align.center(bannerText, vertical="middle"),
+        title="[bright_cyan]SYSTEM DASHBOARD[/]",
+        border_style="bright_cyan",
+        padding=(0, 2),
+        box=box.ROUNDED
     )
-    
-    # Build PC table with enhanced styling
-    if pcStatus and pc:
-        pcBoot = now - pc.get('bootTime', now)
-        pcTable = Table(
-            title="PC Info",
-            expand=True, 
-            box=box.ROUNDED,
-            border_style="bright_blue",
-            show_header=False,
-            padding=(0, 1)
-        )
-        pcTable.add_column("Metric", justify="left", ratio=2, style="bright_white")
-        pcTable.add_column("Value", justify="left", ratio=5)
-        
-        pcTable.add_row("[bright_cyan]Uptime[/]", f"[bright_white]{formatUptime(pcBoot)}[/]")
-        pcTable.add_row("", "")
-        pcTable.add_row("[bright_cyan]=== CPU[/]", "")
-        pcTable.add_row("  +- Usage", f"{floatToColor(pc['cpu']['percent'], 0, 100, True)}% {richProgressBar(pc['cpu']['percent'], 0, 100, 40)}")
-        pcTable.add_row("  +- Frequency", f"{floatToColor(pc['cpu']['freq'], 0, pc['cpu']['maxFreq'] / 1000)} GHz  [dim](Max: {pc['cpu']['maxFreq'] / 1000:.1f} GHz)[/]")
-        pcTable.add_row("  +- Temperature", f"{floatToColor(pc['cpu']['temp'], 0, 100)}C")
-        pcTable.add_row("", "")
-        pcTable.add_row("[bright_cyan]=== GPU[/]", "")
-        pcTable.add_row("  +- Usage", f"{floatToColor(pc['gpu']['percent'], 0, 100, True)}% {richProgressBar(pc['gpu']['percent'], 0, 100, 40)}")
-        pcTable.add_row("  +- Temperature", f"{floatToColor(pc['gpu']['temp'], 0, 100)}C")
-        pcTable.add_row("  +- Memory Used", f"[bright_yellow]{formatBytes(pc['gpu']['memUsed'])}[/]")
-        pcTable.add_row("  +- Memory Free", f"[bright_green]{formatBytes(pc['gpu']['memFree'])}[/]")
-        pcTable.add_row("", "")
-        pcTable.add_row("[bright_cyan]=== RAM[/]", "")
-        pcTable.add_row("  +- Usage", f"{floatToColor(pc['mem']['percent'], 0, 100, True)}% {richProgressBar(pc['mem']['percent'], 0, 100, 40)}")
-        pcTable.add_row("  +- Used", f"[bright_yellow]{formatBytes(pc['mem']['used'])}[/] / [dim]{formatBytes(pc['mem']['total'])}[/]")
-        pcTable.add_row("  +- Available", f"[bright_green]{formatBytes(pc['mem']['available'])}[/]")
-        pcTable.add_row("", "")
-        pcTable.add_row("[bright_cyan]=== Network[/]", "")
-        pcTable.add_row("  +- Total Received", f"[bright_green]{formatBytes(pc['network']['recv'])}[/]")
-        pcTable.add_row("  +- Total Sent", f"[bright_blue]{formatBytes(pc['network']['sent'])}[/]")
-        pcTable.add_row("  +- Speed Received", f"[bright_green]{formatBytes(pc['network']['recvPerSec'])}/s[/]")
-        pcTable.add_row("  +- Speed Sent", f"[bright_blue]{formatBytes(pc['network']['sentPerSec'])}/s[/]")
-    else:
+
+
+def makePcTable(hostName, pc, hostOnline, pcUptime):
+    """PC info table for the PC on screen, or the host grid."""
+    if HOST_VIEW == "grid" and len(hosts) > 1:
+        return makeHostGrid()
+    if not (hostOnline and pc):
         pcTable = Table(expand=True, box=box.ROUNDED, border_style="red", show_header=False)
         pcTable.add_column("Status", justify="center")
-        pcTable.add_row("[red]! PC OFFLINE[/]")
+        pcTable.add_row("[red]! PC OFFLINE[/]" if len(hosts) == 1 else f"[red]! {hostName} OFFLINE[/]")
         pcTable.add_row("[dim]Waiting for connection...[/]")
+        return pcTable
     
-    # Build Pi table with enhanced styling
-    piBoot = now - selfInfo.get('upTime', now)
+    pcTable = Table(
+        title="PC Info" if len(hosts) == 1 else f"PC Info - {hostName}",
+        expand=True, 
+        box=box.ROUNDED,
+        border_style="bright_blue",
+        show_header=False,
+        padding=(0, 1)
+    )
+    pcTable.add_column("Metric", justify="left", ratio=2, style="bright_white")
+    pcTable.add_column("Value", justify="left", ratio=5)
+    
+    pcTable.add_row("[bright_cyan]Uptime[/]", f"[bright_white]{pcUptime}[/]")
+    pcTable.add_row("", "")
+    pcTable.add_row("[bright_cyan]=== CPU[/]", "")
+    pcTable.add_row("  +- Usage", f"{floatToColor(pc['cpu']['percent'], 0, 100, True)}% {richProgressBar(pc['cpu']['percent'], 0, 100, 40)} [cyan]{sparkline(hostName, 'cpu')}[/]")
+    if pc['cpu'].get('perCore'):
+        busiest = max(usage or 0.0 for usage in pc['cpu']['perCore'])
+        pcTable.add_row("  +- Cores", f"[cyan]{coreBars(pc['cpu']['perCore'])}[/]  [dim]busiest[/] {floatToColor(busiest, 0, 100, True)}%")
+    pcTable.add_row("  +- Frequency", f"{floatToColor(pc['cpu']['freq'], 0, pc['cpu']['maxFreq'] / 1000)} GHz  [dim](Max: {pc['cpu']['maxFreq'] / 1000:.1f} GHz)[/]")
+    pcTable.add_row("  +- Temperature", f"{floatToColor(pc['cpu'].get('temp') or 0.0, 0, 100)}C  [red]{sparkline(hostName, 'cpuTemp')}[/]")
+    pcTable.add_row("", "")
+    pcTable.add_row("[bright_cyan]=== GPU[/]", "")
+    pcTable.add_row("  +- Usage", f"{floatToColor(pc['gpu']['percent'], 0, 100, True)}% {richProgressBar(pc['gpu']['percent'], 0, 100, 40)} [cyan]{sparkline(hostName, 'gpu')}[/]")
+    pcTable.add_row("  +- Temperature", f"{floatToColor(pc['gpu']['temp'], 0, 100)}C")
+    pcTable.add_row("  +- Memory Used", f"[bright_yellow]{formatBytes(pc['gpu']['memUsed'])}[/]")
+    pcTable.add_row("  +- Memory Free", f"[bright_green]{formatBytes(pc['gpu']['memFree'])}[/]")
+    # Further cards of a multi-GPU machine get one line each
+    for card in pc['gpu'].get('cards', [])[1:]:
+        pcTable.add_row(f"  +- GPU {card['index']}", f"{floatToColor(card['percent'], 0, 100, True)}% {richProgressBar(card['percent'], 0, 100, 20)} {floatToColor(card['temp'], 0, 100)}C [bright_yellow]{formatBytes(card['memUsed'])}[/]")
+    pcTable.add_row("", "")
+    pcTable.add_row("[bright_cyan]=== RAM[/]", "")
+    pcTable.add_row("  +- Usage", f"{floatToColor(pc['mem']['percent'], 0, 100, True)}% {richProgressBar(pc['mem']['percent'], 0, 100, 40)} [cyan]{sparkline(hostName, 'mem')}[/]")
+    pcTable.add_row("  +- Used", f"[bright_yellow]{formatBytes(pc['mem']['used'])}[/] / [dim]{formatBytes(pc['mem']['total'])}[/]")
+    pcTable.add_row("  +- Available", f"[bright_green]{formatBytes(pc['mem']['available'])}[/]")
+    pcTable.add_row("", "")
+    pcTable.add_row("[bright_cyan]=== Network[/]", "")
+    pcTable.add_row("  +- Total Received", f"[bright_green]{formatBytes(pc['network']['recv'])}[/]")
+    pcTable.add_row("  +- Total Sent", f"[bright_blue]{formatBytes(pc['network']['sent'])}[/]")
+    pcTable.add_row("  +- Speed Received", f"[bright_green]{formatBytes(pc['network']['recvPerSec'])}/s  {sparkline(hostName, 'recv')}[/]")
+    pcTable.add_row("  +- Speed Sent", f"[bright_blue]{formatBytes(pc['network']['sentPerSec'])}/s  {sparkline(hostName, 'sent')}[/]")
+    return pcTable
+
+
+def makePiTable(selfInfo, piUptime, startup=None):
+    """Raspberry Pi info table, startup is the seconds the dashboard took to its first frame."""
     piTable = Table(
         title="pi Info",
         expand=True,
@@ -371,66 +968,49 @@ def makeLayout():
     piTable.add_column("Metric", justify="left", ratio=2, style="bright_white")
     piTable.add_column("Value", justify="left", ratio=5)
     
-    piTable.add_row("[bright_magenta]Uptime[/]", f"[bright_white]{formatUptime(piBoot)}[/]")
+    piTable.add_row("[bright_magenta]Uptime[/]", f"[bright_white]{piUptime}[/]" + (f"  [dim](dashboard up in {startup:.2f}s)[/]" if startup is not None else ""))
     piTable.add_row("", "")
     piTable.add_row("[bright_magenta]=== CPU[/]", "")
-    piTable.add_row("  +- Usage", f"{floatToColor(selfInfo['cpuPercent'], 0, 100, True)}% {richProgressBar(selfInfo['cpuPercent'], 0, 100, 30)}")
-    piTable.add_row("  +- Temperature", f"{floatToColor(selfInfo['cpuTemp'], 0, 100)}C")
+    piTable.add_row("  +- Usage", f"{floatToColor(selfInfo['cpuPercent'], 0, 100, True)}% {richProgressBar(selfInfo['cpuPercent'], 0, 100, 30)} [magenta]{sparkline('pi', 'cpu')}[/]")
+    piTable.add_row("  +- Temperature", f"{floatToColor(selfInfo['cpuTemp'], 0, 100)}C  [red]{sparkline('pi', 'temp')}[/]")
+    if selfInfo.get('cpuCores'):
+        piTable.add_row("  +- Cores", " ".join(f"{floatToColor(core, 0, 100, True)}%" for core in selfInfo['cpuCores']))
     piTable.add_row("", "")
     piTable.add_row("[bright_magenta]=== RAM[/]", "")
-    piTable.add_row("  +- Usage", f"{floatToColor(selfInfo['memPercent'], 0, 100, True)}% {richProgressBar(selfInfo['memPercent'], 0, 100, 30)}")
+    piTable.add_row("  +- Usage", f"{floatToColor(selfInfo['memPercent'], 0, 100, True)}% {richProgressBar(selfInfo['memPercent'], 0, 100, 30)} [magenta]{sparkline('pi', 'mem')}[/]")
     piTable.add_row("  +- Used", f"[bright_yellow]{formatBytes(selfInfo['memUsed'])}[/]")
     piTable.add_row("  +- Total", f"[dim]{formatBytes(selfInfo['memTotal'])}[/]")
-    
-    # CPU Top Table with enhanced styling
-    cpuTable = Table(
-        title="[bright_yellow]TOP CPU PROCESSES[/]",
-        expand=True,
-        box=box.ROUNDED,
-        border_style="bright_yellow",
-        padding=(0, 1)
-    )
-    cpuTable.add_column("PID", justify="center", ratio=1, style="cyan")
-    cpuTable.add_column("Name", justify="left", ratio=4, style="bright_white")
-    cpuTable.add_column("CPU%", justify="right", ratio=1.5, style="yellow")
-    cpuTable.add_column("Avg%", justify="right", ratio=1.5, style="dim yellow")
-    cpuTable.add_column("MEM%", justify="right", ratio=1.5, style="green")
-    
-    if pcStatus and pc.get('processes', {}).get('cpuTop'):
-        for proc in pc['processes']['cpuTop'].values():
-            cpuTable.add_row(
-                str(proc['pid']),
-                proc['name'][:30],
-                f"{proc['cpuPer']:.1f}",
-                f"{(proc['cpuPer'] / 32):.1f}",
-                f"{proc['memPer']:.1f}",
-            )
-    
-    # Memory Top Table with enhanced styling
-    memTable = Table(
-        title="[bright_green]TOP MEMORY PROCESSES[/]",
+    return piTable
+
+
+def makeProcessTable(title, color, processes):
+    """Top processes table, processes being the server's cpuTop or memTop dict."""
+    table = Table(
+        title=f"[{color}]{title}[/]",
         expand=True,
         box=box.ROUNDED,
-        border_style="bright_green",
+        border_style=color,
         padding=(0, 1)
     )
-    memTable.add_column("PID", justify="center", ratio=1, style="cyan")
-    memTable.add_column("Name", justify="left", ratio=4, style="bright_white")
-    memTable.add_column("CPU%", justify="right", ratio=1.5, style="yellow")
-    memTable.add_column("Avg%", justify="right", ratio=1.5, style="dim yellow")
-    memTable.add_column("MEM%", justify="right", ratio=1.5, style="green")
-    
-    if pcStatus and pc.get('processes', {}).get('memTop'):
-        for proc in pc['processes']['memTop'].values():
-            memTable.add_row(
-                str(proc['pid']),
-                proc['name'][:30],
-                f"{proc['cpuPer']:.1f}",
-                f"{(proc['cpuPer'] / 32):.1f}",
-                f"{proc['memPer']:.1f}",
-            )
+    table.add_column("PID", justify="center", ratio=1, style="cyan")
+    table.add_column("Name", justify="left", ratio=4, style="bright_white")
+    table.add_column("CPU%", justify="right", ratio=1.5, style="yellow")
+    table.add_column("Avg%", justify="right", ratio=1.5, style="dim yellow")
+    table.add_column("MEM%", justify="right", ratio=1.5, style="green")
     
-    # Weather Table
+    for proc in (processes or {}).values():
+        table.add_row(
+            str(proc['pid']),
+            proc['name'][:30],
+            f"{proc['cpuPer']:.1f}",
+            f"{(proc['cpuPer'] / 32):.1f}",
+            f"{proc['memPer']:.1f}",
+        )
+    return table
+
+
+def makeWeatherTable(weather, nextHour):
+    """Current, next hour, today and tomorrow's weather, nextHour is that hour's forecast entry."""
     weatherTable = Table(
         title="\nWEATHER FORECAST",
         expand=True,
@@ -453,15 +1033,17 @@ def makeLayout():
         weatherTable.add_row("  +- Precipitation", f"[bright_blue]{weather['current']['precip_mm']:.1f} mm[/]")
         weatherTable.add_row("  +- UV Index", f"[bright_yellow]{weather['current']['uv']:.1f}[/]")
         
-        nextHour = min(23, int(time.strftime("%H")) + 1)
         weatherTable.add_row("", "")
         weatherTable.add_row("[bright_cyan]=== Next Hour[/]", "")
-        weatherTable.add_row("  +- Temperature", f"[bright_yellow]{todayForecast['hour'][nextHour]['temp_c']:.1f}C[/]")
-        weatherTable.add_row("  +- Humidity", f"[bright_blue]{todayForecast['hour'][nextHour]['humidity']}%[/]")
-        weatherTable.add_row("  +- Cloud Cover", f"[dim white]{todayForecast['hour'][nextHour]['cloud']}%[/]")
-        weatherTable.add_row("  +- Wind Speed", f"[bright_cyan]{todayForecast['hour'][nextHour]['wind_mph']:.1f} mph[/]")
-        weatherTable.add_row("  +- Precipitation", f"[bright_blue]{todayForecast['hour'][nextHour]['precip_mm']:.1f} mm[/]")
-        weatherTable.add_row("  +- UV Index", f"[bright_yellow]{todayForecast['hour'][nextHour]['uv']:.1f}[/]")
+        if nextHour is None:
+            weatherTable.add_row("  +- [dim]No forecast[/]", "")
+        else:
+            weatherTable.add_row("  +- Temperature", f"[bright_yellow]{nextHour['temp_c']:.1f}C[/]")
+            weatherTable.add_row("  +- Humidity", f"[bright_blue]{nextHour['humidity']}%[/]")
+            weatherTable.add_row("  +- Cloud Cover", f"[dim white]{nextHour['cloud']}%[/]")
+            weatherTable.add_row("  +- Wind Speed", f"[bright_cyan]{nextHour['wind_mph']:.1f} mph[/]")
+            weatherTable.add_row("  +- Precipitation", f"[bright_blue]{nextHour['precip_mm']:.1f} mm[/]")
+            weatherTable.add_row("  +- UV Index", f"[bright_yellow]{nextHour['uv']:.1f}[/]")
         
         weatherTable.add_row("", "")
         weatherTable.add_row("[bright_cyan]=== Today[/]", "")
@@ -481,75 +1063,233 @@ def makeLayout():
         weatherTable.add_row("  +- Total Precip", f"[bright_blue]{tomForecast['day']['totalprecip_mm']:.1f} mm[/]")
     else:
         weatherTable.add_row("[yellow]Loading weather data...[/yellow]", "")
-    
-    # Organize panels
-    leftColumn = Group(
-        pcTable,
-        Group(cpuTable, memTable)
+    return weatherTable
+
+
+def makeServicesTable(services):
+    """Watched processes and systemd units, two per row."""
+    servicesTable = Table(
+        title="SERVICES",
+        expand=True,
+        box=box.ROUNDED,
+        border_style="bright_magenta",
+        show_header=False,
+        padding=(0, 1)
     )
+    for _ in range(2):
+        servicesTable.add_column("Service", justify="left", ratio=2, style="bright_white", no_wrap=True)
+        servicesTable.add_column("State", justify="left", ratio=2, no_wrap=True)
     
-    rightColumn = Group(
-        piTable,
-        weatherTable
-    )
+    cells = []
+    for name, state in services.items():
+        color = "green" if state == "running" or state.startswith("active") else "red"
+        cells += [name, f"[{color}]{state}[/]"]
+    if not cells:
+        cells = ["[dim]Scanning...[/]", ""]
+    cells += [""] * (-len(cells) % 4)
+    for i in range(0, len(cells), 4):
+        servicesTable.add_row(*cells[i:i + 4])
+    return servicesTable
+
+
+def makeLayout():
+    """Update the dashboard's panels, rebuilding only those whose inputs changed."""
+    global dashboard
+    
+    hostName = currentHost()
+    host = hosts[hostName]
+    pc = host["pc"]
+    hostOnline = host["status"]
+    
+    now = time.time()
+    localTime = time.localtime(now)
+    
+    hourInAmPm = time.strftime("%I:%M %p", localTime)
+    dayWeek = time.strftime("%A", localTime)
+    month = time.strftime("%B %d, %Y", localTime)
+    
+    # Enhanced banner with status indicator
+    if len(hosts) == 1:
+        statusIndicator = "[green]ONLINE[/]" if pcStatus else "[red]OFFLINE[/]"
+    else:
+        onlineCount = sum(host["status"] for host in hosts.values())
+        statusIndicator = f"[{'green' if onlineCount == len(hosts) else 'yellow'}]{onlineCount}/{len(hosts)} ONLINE[/]"
+    
+    # Each key holds everything its panel shows, unchanged snapshot parts keep their identity
+    bannerKey = (hourInAmPm, dayWeek, month, statusIndicator)
+    panels["banner"].update(bannerKey, lambda: makeBanner(hourInAmPm, dayWeek, month, statusIndicator))
+    
+    if HOST_VIEW == "grid" and len(hosts) > 1:
+        pcKey = tuple((host["seq"], host["status"]) for host in hosts.values())
+        pcUptime = None
+    else:
+        pcUptime = formatUptime(now - pc.get('bootTime', now)) if pc else None
+        pcKey = (hostName, hostOnline, host["seq"], pcUptime)
+    panels["pc"].update(pcKey, lambda: makePcTable(hostName, pc, hostOnline, pcUptime))
+    
+    info = selfInfo
+    piUptime = formatUptime(now - info.get('upTime', now))
+    startup = startupSeconds.get("wake", startupSeconds.get("launch"))
+    panels["pi"].update((info, piUptime, startup), lambda: makePiTable(info, piUptime, startup))
+    
+    hostLabel = "" if len(hosts) == 1 else f" - {hostName}"
+    processes = pc.get('processes', {}) if hostOnline else {}
+    cpuTop, memTop = processes.get('cpuTop'), processes.get('memTop')
+    panels["cpuTop"].update((hostLabel, cpuTop), lambda: makeProcessTable(f"TOP CPU PROCESSES{hostLabel}", "bright_yellow", cpuTop))
+    panels["memTop"].update((hostLabel, memTop), lambda: makeProcessTable(f"TOP MEMORY PROCESSES{hostLabel}", "bright_green", memTop))
     
-    mainTable = Table(expand=True, box=None, show_header=False, padding=(0, 1))
-    mainTable.add_column("Left", justify="center", ratio=1)
-    mainTable.add_column("Right", justify="center", ratio=1)
-    mainTable.add_row(leftColumn, rightColumn)
+    currentWeather = weather
+    nextHour = forecastAt(now + 3600)
+    panels["weather"].update((currentWeather, nextHour), lambda: makeWeatherTable(currentWeather, nextHour))
     
-    layout["body"].update(mainTable)
+    currentServices = services
+    panels["services"].update(currentServices, lambda: makeServicesTable(currentServices))
     
-    return layout
+    if dashboard is None:
+        dashboard = Layout()
+        dashboard.split_column(
+            Layout(panels["banner"], name="banner", size=7),
+            Layout(name="body"),
+        )
+        
+        # Organize panels
+        leftColumn = Group(
+            panels["pc"],
+            Group(panels["cpuTop"], panels["memTop"])
+        )
+        
+        rightColumn = Group(
+            panels["pi"],
+            panels["weather"],
+            panels["services"]
+        )
+        
+        mainTable = Table(expand=True, box=None, show_header=False, padding=(0, 1))
+        mainTable.add_column("Left", justify="center", ratio=1)
+        mainTable.add_column("Right", justify="center", ratio=1)
+        mainTable.add_row(leftColumn, rightColumn)
+        
+        dashboard["body"].update(mainTable)
+    
+    return dashboard
+
 
+def nextClockChange(now):
+    """Wall time at which the clock, an uptime or the rotating PC next changes on screen."""
+    due = (now // 60 + 1) * 60
+    for boot in (selfInfo.get('upTime'), hosts[currentHost()]["pc"].get('bootTime')):
+        if boot:
+            due = min(due, boot + ((now - boot) // 60 + 1) * 60)
+    if HOST_VIEW == "rotate" and len(hosts) > 1:
+        due = min(due, (now // ROTATE_SECONDS + 1) * ROTATE_SECONDS)
+    return due
 
-def main():
+
+def main(recordPath=None, replayPath=None, speed=1.0):
     """Main entry point."""
+    global drawnVersion
+    # kill and systemd stop send SIGTERM, which then shuts down like Ctrl+C
+    signal.signal(signal.SIGTERM, terminate)
     print("\n\033[36m" + "═" * columns + "\033[0m")
     print(f"{'SYSTEM INITIALIZATION':^{columns}}")
     print("\033[36m" + "═" * columns + "\033[0m\n")
     
     print("  > Starting daemons...")
-    t1 = threading.Thread(target=pcCollector, daemon=True)
-    t1.start()
-    print("    \033[32m[+]\033[0m PC collector daemon online")
-    
-    t2 = threading.Thread(target=selfCollector, daemon=True)
-    t2.start()
-    print("    \033[32m[+]\033[0m Self-info daemon online")
-    
-    t3 = threading.Thread(target=weatherCollector, daemon=True)
-    t3.start()
-    print("    \033[32m[+]\033[0m Weather daemon online")
-    
-    print("\n  > Waiting for data synchronization...")
-    time.sleep(2)
-    print("    \033[32m[+]\033[0m All systems ready\n")
+    daemons = []
+    if replayPath:
+        daemons.append(startReplay(replayPath, speed))
+        print(f"    \033[32m[+]\033[0m Replay daemon online ({replayPath}, {f'{speed:g}x' if speed > 0 else 'max speed'})")
+    if recordPath:
+        startRecording(recordPath)
+        print(f"    \033[32m[+]\033[0m Recording to {recordPath}")
+    if not replayPath:
+        # Before the weather daemon starts, so a forecast still fresh on disk isn't fetched again
+        loadWeatherCache()
+        openStores()
+        for name in hosts:
+            thread = threading.Thread(target=pcCollector, args=(name,), daemon=True)
+            thread.start()
+            daemons.append(thread)
+            print(f"    \033[32m[+]\033[0m PC collector daemon online ({name})")
+        
+        t2 = threading.Thread(target=selfCollector, daemon=True)
+        t2.start()
+        daemons.append(t2)
+        print("    \033[32m[+]\033[0m Self-info daemon online")
+        
+        t3 = threading.Thread(target=weatherCollector, daemon=True)
+        t3.start()
+        daemons.append(t3)
+        print("    \033[32m[+]\033[0m Weather daemon online")
+        
+        t4 = threading.Thread(target=serviceCollector, daemon=True)
+        t4.start()
+        daemons.append(t4)
+        print("    \033[32m[+]\033[0m Service monitor daemon online")
     
-    time.sleep(1)
+    if not FAST_START:
+        print("\n  > Waiting for data synchronization...")
+        time.sleep(2)
+        print("    \033[32m[+]\033[0m All systems ready\n")
+        time.sleep(1)
     startUp()
     
     try:
-        with Live(makeLayout(), refresh_per_second=1, console=console, screen=True) as live:
+        # Frames are only drawn when a collector published something or the clock moved
+        with Live(makeLayout(), auto_refresh=False, console=console, screen=True) as live:
+            version = drawnVersion = stateVersion
+            drawingEvent.set()
+            # From process creation, so interpreter start and imports are counted too
+            startupSeconds["launch"] = time.time() - psutil.Process().create_time()
+            publish()
             while True:
-                time.sleep(1)
+                with stateCond:
+                    timeout = max(0.0, nextClockChange(time.time()) - time.time())
+                    stateCond.wait_for(lambda: stateVersion != version, timeout)
+                    version = stateVersion
                 
-                if not pcStatus:
+                wokeAt = None
+                # Sleep mode only once every PC had its chance to connect, a fast start draws before they have
+                if not pcStatus and all(host["status"] is not None for host in hosts.values()):
                     live.stop()
-                    periodicUpdate()
+                    wokeAt = periodicUpdate()
                     live.start()
-                else:
-                    live.update(makeLayout())
+                live.update(makeLayout(), refresh=True)
+                if wokeAt is not None:
+                    startupSeconds["wake"] = time.monotonic() - wokeAt
+                    publish()
+                with stateCond:
+                    drawnVersion = version
+                    stateCond.notify_all()
+                # Max speed replays are meant to draw every change
+                if not (replayPath and speed <= 0):
+                    time.sleep(1 / MAX_FPS)
     except KeyboardInterrupt:
         print("\n\n\033[33m  > Shutting down gracefully...\033[0m")
         stopEvent.set()
-        t1.join(timeout=2)
-        t2.join(timeout=2)
-        t3.join(timeout=2)
+        with stateCond:
+            stateCond.notify_all()
+        for thread in daemons:
+            thread.join(timeout=2)
+        stopRecording()
         print("  \033[32m[+] All daemons stopped\033[0m")
+        for name, seconds in startupSeconds.items():
+            print(f"  i First frame {seconds:.2f}s after {name}")
         print("  \033[32m[+] Shutdown complete\033[0m\n")
-        goodbye()
+        if not FAST_START:
+            goodbye()
+    finally:
+        stopRecording()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Raspberry Pi system dashboard.")
+    parser.add_argument("--record", metavar="FILE", help="Record every change of the displayed data to FILE (gzipped JSON lines)")
+    parser.add_argument("--replay", metavar="FILE", help="Play back a recorded FILE instead of collecting, no server or weather API needed")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier, 0 for as fast as frames can be drawn")
+    parser.add_argument("--fast-start", action="store_true", help="Skip the intro animations and pauses, the dashboard is up in about a second")
+    parser.add_argument("--weather-url", metavar="URL", help="Fetch the forecast from URL instead of API_URL, e.g. a local weather_stub.py")
+    args = parser.parse_args()
+    FAST_START = FAST_START or args.fast_start
+    API_URL = args.weather_url or API_URL
+    main(args.record, args.replay, args.speed)
\ No newline at end of file
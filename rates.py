@@ -0,0 +1,35 @@
+"""Per-second rates of cumulative counters, timed on the monotonic clock."""
+import time
+
+
+class Rates:
+    """The last reading of a set of counters and when it was taken.
+
+    Each collector keeps its own instance and passes every counter it read on
+    each run. Rates are divided by the time that really passed, so they stay
+    right whatever the cadence, and counters no longer passed in are dropped.
+    """
+
+    def __init__(self):
+        self.last = {}  # key -> (monotonic time, value)
+
+    def update(self, counters, now=None):
+        """Per-second change of each counter since the previous update.
+
+        A key seen for the first time has no rate yet and gives None. A counter
+        that went backwards was reset (an interface recreated, a driver reloaded,
+        a 32-bit wrap) and is counted up from zero again.
+        """
+        if now is None:
+            now = time.monotonic()
+        rates, current = {}, {}
+        for key, value in counters.items():
+            current[key] = (now, value)
+            previous = self.last.get(key)
+            if previous is None or now <= previous[0]:
+                rates[key] = None
+                continue
+            then, old = previous
+            rates[key] = (value - old if value >= old else value) / (now - then)
+        self.last = current
+        return rates
@@ -1,14 +1,40 @@
-from flask import Flask, Response, jsonify
-import psutil, GPUtil, json, time
+from flask import Flask, Response, request
+import psutil, json, time, threading
+import concurrent.futures, collections, gzip, zlib, argparse, bisect, contextlib, heapq
+import wire, history, gpu, rates, os
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 app = Flask(__name__)
 
+SAMPLE_INTERVAL = 1.0  # Scheduler tick, collectors run on multiples of it
+DEMAND_TIMEOUT = 10.0  # Collectors no client asked for in this many seconds go idle
+SCRAPE_HOLD = 120.0  # Seconds a /metrics scrape keeps every collector running for the next one
+STREAM_HEARTBEAT = 2.0  # Seconds between keep-alive comments on a quiet stream
+PATCH_HISTORY = 32  # Recent snapshots kept as bases for delta responses
+COMPRESS_MIN_SIZE = 512  # Smaller bodies aren't worth compressing
+ENCODINGS = ["zstd", "gzip"] if zstandard else ["gzip"]
+HISTORY_SECONDS = 24 * 3600  # In-memory history kept per machine, at one sample per tick
+MAX_HISTORY_POINTS = 2000  # Upper bound for ?points= on /history
+RELAY_CONNECT_TIMEOUT = 2  # Seconds to reach an upstream server
+RELAY_STREAM_TIMEOUT = 5  # Seconds of silence before an upstream counts as offline
+RELAY_MAX_BACKOFF = 30  # Upper bound for the upstream reconnect delay
+TIMING_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)  # Latency histogram bounds in seconds, plus +Inf
+META_FIELD = "_meta"  # Opt-in snapshot field with collector timings, ?fields=cpu,_meta
+PROMETHEUS = "text/plain; version=0.0.4; charset=utf-8"  # /metrics exposition format
+TOP_K = 5  # Processes in cpuTop and memTop, and names per ranking in byName
+GPU_BACKEND = "auto"  # auto (NVML, then GPUtil), nvml, gputil, fake[:N] or none
+
 pc = {
-    "cpu": {"percent": 0.0, "freq": 0.0, "maxFreq": 0.0, "temp": 0.0, "cores": 0, "threads": 0},
+    "cpu": {"percent": 0.0, "perCore": [], "freq": 0.0, "maxFreq": 0.0, "temp": 0.0, "cores": 0, "threads": 0},
     "mem": {"total": 0, "available": 0, "used": 0, "percent": 0.0},
     "storage": {},
-    "network": {"sent": 0, "recv": 0, "sentPerSec": 0, "recvPerSec": 0},
-    "gpu": {"memFree": 0, "memUsed": 0, "percent": 0.0, "temp": 0.0},
+    "network": {"sent": 0, "recv": 0, "sentPerSec": 0, "recvPerSec": 0, "interfaces": {}},
+    "disk": {},
+    "gpu": {"memFree": 0, "memUsed": 0, "percent": 0.0, "temp": 0.0, "cards": []},
     "bootTime": 0,
     "processes": {"cpuTop": {
       "0": {
@@ -77,81 +103,258 @@ pc = {
   }
 }
 
+# Latency histograms of collectors and their expensive steps
+timings = {}  # Step name -> {"count", "errors", "timeouts", "total", "max", "last", "buckets"}
+timingsLock = threading.Lock()
+
+def timingFor(name):
+    """The histogram of a step, created on first use. Call with timingsLock held."""
+    timing = timings.get(name)
+    if timing is None:
+        timing = timings[name] = {
+            "count": 0, "errors": 0, "timeouts": 0, "total": 0.0, "max": 0.0, "last": 0.0,
+            "buckets": [0] * (len(TIMING_BUCKETS) + 1)  # Per bound, the last one is +Inf
+        }
+    return timing
+
+
+def recordTiming(name, seconds, failed=False):
+    """Add one run of a step to its histogram."""
+    with timingsLock:
+        timing = timingFor(name)
+        timing["count"] += 1
+        timing["total"] += seconds
+        timing["last"] = seconds
+        timing["max"] = max(timing["max"], seconds)
+        timing["buckets"][bisect.bisect_left(TIMING_BUCKETS, seconds)] += 1
+        if failed:
+            timing["errors"] += 1
+
+
+@contextlib.contextmanager
+def timed(name):
+    """Time a block into its histogram, exceptions passing through count as errors."""
+    start = time.perf_counter()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        recordTiming(name, time.perf_counter() - start, failed)
+
+
+def timingReport():
+    """Every histogram with its mean, max and estimated percentiles in ms."""
+    def percentile(timing, q):
+        # Upper bound of the bucket holding the q-th run, the max for +Inf
+        rank, seen = q * timing["count"], 0
+        for bound, count in zip(TIMING_BUCKETS, timing["buckets"]):
+            seen += count
+            if seen >= rank:
+                return round(min(bound, timing["max"]) * 1000, 3)
+        return round(timing["max"] * 1000, 3)
+
+    with timingsLock:
+        return {name: {
+            "count": timing["count"],
+            "errors": timing["errors"],
+            "timeouts": timing["timeouts"],
+            "lastMs": round(timing["last"] * 1000, 3),
+            "meanMs": round(timing["total"] / timing["count"] * 1000, 3) if timing["count"] else 0.0,
+            "maxMs": round(timing["max"] * 1000, 3),
+            "p50Ms": percentile(timing, 0.5),
+            "p95Ms": percentile(timing, 0.95),
+            "buckets": list(timing["buckets"]),
+        } for name, timing in sorted(timings.items())}
+
+
+def timingSummary():
+    """Compact per-step figures for the snapshot's _meta block."""
+    with timingsLock:
+        return {name: {
+            "lastMs": round(timing["last"] * 1000, 3),
+            "maxMs": round(timing["max"] * 1000, 3),
+            "errors": timing["errors"],
+            "timeouts": timing["timeouts"],
+        } for name, timing in timings.items()}
+
+
+processHandles = {}  # pid -> (psutil.Process, start time), kept between samples for cpu_percent
+
+
+def startTime(proc):
+    """When the process now behind proc's pid started, read inside proc.oneshot().
+
+    psutil caches create_time() per handle, so it can't tell that a pid was
+    reused. On Linux the start is taken from the stat read oneshot() already
+    made; elsewhere a reused pid is only noticed through is_running().
+    """
+    parse = getattr(proc._proc, "_parse_stat_file", None)
+    if parse is not None:
+        return parse()["create_time"]
+    return proc.create_time() if proc.is_running() else None
+
+
+def readProcess(proc):
+    """(start time, name, cpu, mem) of a process from one oneshot() read."""
+    with proc.oneshot():
+        return startTime(proc), proc.name(), proc.cpu_percent(), proc.memory_percent()
+
+
 def getProcessInfo():
-    """Get top 5 processes by CPU and memory usage"""
-    processes = []
-    
-    # Iterate through all processes
-    for proc in psutil.process_iter(['pid', 'name', 'memory_percent', 'cpu_percent']):
-        try:
-            # Get process info
-            pinfo = proc.info
-            processes.append({
-                'pid': pinfo['pid'],
-                'name': pinfo['name'],
-                'memPer': round((pinfo['memory_percent']), 2),
-                'cpuPer': round((pinfo['cpu_percent']), 2)
-            })
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            pass
-    
-    # Sort by CPU usage (descending) and get top 5
-    cpu_top = sorted(processes, key=lambda x: x['cpuPer'], reverse=True)[:5]
-    
-    # Sort by memory usage (descending) and get top 5
-    mem_top = sorted(processes, key=lambda x: x['memPer'], reverse=True)[:5]
-    
-    # Build the JSON structure
-    pcTop = {
-        "processes": {
-            "cpuTop": {},
-            "memTop": {}
+    """Top TOP_K processes by CPU and memory, and usage summed per process name.
+
+    Process handles are kept between samples, keyed by pid and start time,
+    so cpu_percent is measured since the previous scan and new processes
+    show 0 until their second sample. One pass feeds two bounded heaps
+    instead of sorting every process twice.
+    """
+    current = psutil.pids()
+    for pid in processHandles.keys() - set(current):
+        del processHandles[pid]
+
+    cpuHeap, memHeap = [], []  # Min-heaps of (value, pid, name, cpu, mem), at most TOP_K long
+    byName = {}  # name -> [count, cpu, mem]
+    with timed("processes.iter"):
+        for pid in current:
+            kept = processHandles.get(pid)
+            try:
+                if kept is not None:
+                    started, name, cpu, mem = readProcess(kept[0])
+                    if started != kept[1]:
+                        kept = None  # The pid was reused, the kept handle belongs to a dead process
+                if kept is None:
+                    proc = psutil.Process(pid)
+                    started, name, cpu, mem = readProcess(proc)
+                    processHandles[pid] = (proc, started)
+            except psutil.AccessDenied:
+                continue
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                processHandles.pop(pid, None)
+                continue
+
+            row = (cpu, pid, name, cpu, mem)
+            if len(cpuHeap) < TOP_K:
+                heapq.heappush(cpuHeap, row)
+            elif cpu > cpuHeap[0][0]:
+                heapq.heapreplace(cpuHeap, row)
+            row = (mem, pid, name, cpu, mem)
+            if len(memHeap) < TOP_K:
+                heapq.heappush(memHeap, row)
+            elif mem > memHeap[0][0]:
+                heapq.heapreplace(memHeap, row)
+
+            total = byName.get(name)
+            if total is None:
+                byName[name] = [1, cpu, mem]
+            else:
+                total[0] += 1
+                total[1] += cpu
+                total[2] += mem
+
+    with timed("processes.sort"):
+        # Only the winners get rounded and laid out, in the "0".."K-1" shape clients expect
+        def ranked(heap):
+            rows = sorted(heap, reverse=True)
+            return {str(i): {"pid": pid, "name": name, "memPer": round(mem, 2), "cpuPer": round(cpu, 2)}
+                    for i, (_, pid, name, cpu, mem) in enumerate(rows)}
+
+        names = {name for name, _ in heapq.nlargest(TOP_K, byName.items(), key=lambda item: item[1][1])}
+        names.update(name for name, _ in heapq.nlargest(TOP_K, byName.items(), key=lambda item: item[1][2]))
+        return {
+            "cpuTop": ranked(cpuHeap),
+            "memTop": ranked(memHeap),
+            "byName": {name: {"count": byName[name][0], "cpuPer": round(byName[name][1], 2), "memPer": round(byName[name][2], 2)}
+                       for name in sorted(names)},
         }
-    }
-    
-    # Populate cpuTop
-    for i, proc in enumerate(cpu_top):
-        pcTop["processes"]["cpuTop"][str(i)] = proc
-    
-    # Populate memTop
-    for i, proc in enumerate(mem_top):
-        pcTop["processes"]["memTop"][str(i)] = proc
-    
-    return pcTop['processes']
-
-pastSent = 0
-pastRecv = 0
+
+# Registered subsystem collectors, each result is merged into pc[name]
+collectors = {}
+collectorPool = None
+
+def collector(name, interval, timeout):
+    """Register a subsystem collector with its own cadence and timeout."""
+    def register(func):
+        collectors[name] = {
+            "func": func,
+            "interval": interval,  # Seconds between runs
+            "timeout": timeout,    # Seconds a tick waits before publishing without it
+            "lastRun": None,
+            "wantedUntil": None,  # Runs until then because a client asked for this field
+            "pinned": False,     # Runs even without clients
+            "updated": None,     # Last time a result was published
+            "future": None
+        }
+        return func
+    return register
+
+
+def perSecond(rate, digits=None):
+    """Round a rate from rates.Rates, None until there are two readings."""
+    return None if rate is None else round(rate, digits)
+
+
+def usagePercent(busy, total):
+    """Share of a core's time spent busy, from the rates of its busy and total seconds."""
+    if busy is None or not total:
+        return None
+    return round(min(100.0, max(0.0, busy / total * 100)), 1)
+
+
 cpuCores = psutil.cpu_count(logical=False)
 cpuThreads = psutil.cpu_count(logical=True)
-def pcCollector():
-    """Collects system info."""
-    global pastSent, pastRecv
-
-    # CPU
+cpuRates = rates.Rates()
+@collector("cpu", interval=1, timeout=0.5)
+def collectCpu():
+    """CPU usage overall and per core, clocks and temperature."""
     cpu_freq = psutil.cpu_freq()
-    pc["cpu"]["freq"] = cpu_freq.current
-    pc["cpu"]["percent"] = psutil.cpu_percent(interval=None)
-    pc["cpu"]["maxFreq"] = cpu_freq.max
+    counters = {}
+    for core, times in enumerate(psutil.cpu_times(percpu=True)):
+        # Guest time is already counted in user time
+        total = sum(times) - getattr(times, "guest", 0) - getattr(times, "guest_nice", 0)
+        counters[(core, "total")] = total
+        counters[(core, "busy")] = total - times.idle - getattr(times, "iowait", 0)
+    change = cpuRates.update(counters)
+    perCore = [usagePercent(change[(core, "busy")], change[(core, "total")]) for core in range(len(counters) // 2)]
+    overall = None
+    if None not in change.values():
+        overall = usagePercent(sum(v for k, v in change.items() if k[1] == "busy"), sum(v for k, v in change.items() if k[1] == "total"))
+    cpu = {
+        "percent": overall or 0.0,  # Stays a number on the first run, like psutil.cpu_percent
+        "perCore": perCore,
+        "freq": cpu_freq.current,
+        "maxFreq": cpu_freq.max,
+        "cores": cpuCores,
+        "threads": cpuThreads
+    }
     try:
-        pc["cpu"]["temp"] = next(t.current for t in psutil.sensors_temperatures()['k10temp'] if t.label == 'Tctl')
+        with timed("cpu.sensors"):
+            sensors = psutil.sensors_temperatures()
+        # A machine without this sensor isn't an error of the sensor read
+        cpu["temp"] = next(t.current for t in sensors['k10temp'] if t.label == 'Tctl')
     except Exception:
-        pc["cpu"]["temp"] = None
-    pc["cpu"]["cores"] = cpuCores
-    pc["cpu"]["threads"] = cpuThreads
+        cpu["temp"] = None
+    return cpu
+
 
-    # Memory
+@collector("mem", interval=1, timeout=0.5)
+def collectMem():
+    """RAM usage."""
     mem = psutil.virtual_memory()
-    pc["mem"]["total"] = mem.total
-    pc["mem"]["available"] = mem.available
-    pc["mem"]["used"] = mem.used
-    pc["mem"]["percent"] = mem.percent
-
-    # Storage (All mounted disks)
-    pc["storage"] = {}
-    for partition in psutil.disk_partitions():
+    return {"total": mem.total, "available": mem.available, "used": mem.used, "percent": mem.percent}
+
+
+@collector("storage", interval=30, timeout=5)
+def collectStorage():
+    """All mounted disks."""
+    storage = {}
+    with timed("storage.partitions"):
+        partitions = psutil.disk_partitions()
+    for partition in partitions:
         try:
-            usage = psutil.disk_usage(partition.mountpoint)
-            pc["storage"][partition.mountpoint] = {
+            with timed("storage.usage"):
+                usage = psutil.disk_usage(partition.mountpoint)
+            storage[partition.mountpoint] = {
                 "device": partition.device,
                 "fstype": partition.fstype,
                 "total": usage.total,
@@ -162,35 +365,734 @@ def pcCollector():
         except (PermissionError, OSError):
             # Skip partitions that can't be accessed
             pass
+    return storage
+
+
+netRates = rates.Rates()
+@collector("network", interval=1, timeout=0.5)
+def collectNetwork():
+    """Network totals and bytes per second, overall and per interface."""
+    nics = psutil.net_io_counters(pernic=True)
+    counters = {}
+    for nic, io in nics.items():
+        counters[(nic, "sent")] = io.bytes_sent
+        counters[(nic, "recv")] = io.bytes_recv
+    change = netRates.update(counters)
+    interfaces = {nic: {
+        "sent": io.bytes_sent,
+        "recv": io.bytes_recv,
+        "sentPerSec": perSecond(change[(nic, "sent")]),
+        "recvPerSec": perSecond(change[(nic, "recv")])
+    } for nic, io in nics.items()}
+    # Interfaces without a rate yet count as idle in the totals, which stay numbers
+    return {
+        "sent": sum(nic["sent"] for nic in interfaces.values()),
+        "recv": sum(nic["recv"] for nic in interfaces.values()),
+        "sentPerSec": sum(nic["sentPerSec"] or 0 for nic in interfaces.values()),
+        "recvPerSec": sum(nic["recvPerSec"] or 0 for nic in interfaces.values()),
+        "interfaces": interfaces
+    }
 
-    # Network
-    net = psutil.net_io_counters()
-    pc["network"]["sent"] = net.bytes_sent
-    pc["network"]["recv"] = net.bytes_recv
-    pc["network"]["sentPerSec"] = net.bytes_sent - pastSent
-    pc["network"]["recvPerSec"] = net.bytes_recv - pastRecv
-    pastSent, pastRecv = net.bytes_sent, net.bytes_recv
 
-    # GPU
+diskRates = rates.Rates()
+@collector("disk", interval=1, timeout=0.5)
+def collectDisk():
+    """Bytes and operations per second read and written on every disk."""
+    disks = psutil.disk_io_counters(perdisk=True) or {}
+    counters = {}
+    for disk, io in disks.items():
+        counters[(disk, "read")] = io.read_bytes
+        counters[(disk, "write")] = io.write_bytes
+        counters[(disk, "reads")] = io.read_count
+        counters[(disk, "writes")] = io.write_count
+    change = diskRates.update(counters)
+    return {disk: {
+        "readBytes": io.read_bytes,
+        "writeBytes": io.write_bytes,
+        "readPerSec": perSecond(change[(disk, "read")]),
+        "writePerSec": perSecond(change[(disk, "write")]),
+        "readIops": perSecond(change[(disk, "reads")], 1),
+        "writeIops": perSecond(change[(disk, "writes")], 1)
+    } for disk, io in disks.items()}
+
+
+gpuBackend = None  # Opened on the first run, NVML keeps its handles between samples
+@collector("gpu", interval=1, timeout=2)
+def collectGpu():
+    """Load, memory and temperature of every GPU, the first one also at the top level."""
+    global gpuBackend
+    gpuInfo = {"memFree": 0, "memUsed": 0, "percent": 0.0, "temp": 0.0, "cards": []}
+    if gpuBackend is None:
+        gpuBackend = gpu.openBackend(GPU_BACKEND)
     try:
-        for gpu in GPUtil.getGPUs():
-            pc["gpu"]["memFree"] = int(gpu.memoryFree * 1_000_000)
-            pc["gpu"]["memUsed"] = int(gpu.memoryUsed * 1_000_000)
-            pc["gpu"]["percent"] = gpu.load * 100.0
-            pc["gpu"]["temp"] = gpu.temperature
+        with timed("gpu.sample"):
+            cards = gpuBackend.sample()
     except Exception:
-        pc["gpu"] = {"memFree": 0, "memUsed": 0, "percent": 0.0, "temp": 0.0}
+        return gpuInfo
+    if cards:
+        gpuInfo.update({key: cards[0][key] for key in ("memFree", "memUsed", "percent", "temp")})
+    gpuInfo["cards"] = cards
+    return gpuInfo
+
+
+@collector("bootTime", interval=3600, timeout=0.5)
+def collectBootTime():
+    """Boot timestamp, practically constant."""
+    return psutil.boot_time()
+
+
+@collector("processes", interval=3, timeout=2)
+def collectProcesses():
+    """Top processes, the most expensive collector."""
+    return getProcessInfo()
+
+
+def isWanted(entry, now):
+    """Whether a collector has a client or is pinned."""
+    if entry["pinned"]:
+        return True
+    return entry["wantedUntil"] is not None and now <= entry["wantedUntil"]
+
+
+def runCollector(name, func):
+    """Run one collector, timed under its name."""
+    with timed(name):
+        return func()
+
+
+def collectTick():
+    """Start due collectors and return the results that finished in time."""
+    now = time.monotonic()
+    started = []
+    for name, entry in collectors.items():
+        if entry["future"] is not None:
+            # Still running from an earlier tick (e.g. a hung mount)
+            continue
+        if not isWanted(entry, now):
+            continue
+        # Half a tick of slack so scheduling jitter doesn't skip a whole tick
+        if entry["lastRun"] is None or now - entry["lastRun"] >= entry["interval"] - SAMPLE_INTERVAL / 2:
+            entry["lastRun"] = now
+            entry["future"] = collectorPool.submit(runCollector, name, entry["func"])
+            started.append((name, entry))
+
+    for name, entry in started:
+        remaining = entry["timeout"] - (time.monotonic() - now)
+        done, _ = concurrent.futures.wait([entry["future"]], timeout=max(0.0, remaining))
+        if not done:
+            with timingsLock:
+                timingFor(name)["timeouts"] += 1
+
+    results = {}
+    for name, entry in collectors.items():
+        future = entry["future"]
+        if future is None or not future.done():
+            continue
+        entry["future"] = None
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            print(f"Collector {name} failed: {e!r}")
+    return results
+
+
+def newFeed(snapshot):
+    """Published snapshots of one machine, serialized once and shared by every request.
+
+    Sequence numbers start from the wall clock in ms so they don't repeat across restarts.
+    """
+    seq = int(time.time() * 1000)
+    return {
+        "cond": threading.Condition(),
+        "seq": seq,
+        "snapshot": snapshot,
+        "recent": collections.OrderedDict({seq: snapshot}),  # seq -> snapshot, bases for patches
+        "bodies": {},  # (fields, since, format, encoding) -> (body, encoding) of the current snapshot
+        "history": history.History(int(HISTORY_SECONDS / SAMPLE_INTERVAL)),
+        "store": None,  # On-disk MetricStore when --store is given
+        "online": True
+    }
+
+
+localFeed = newFeed(pc)
+relayFeeds = {}  # Upstream servers by name when running as a relay
+samplerThread = None
+wakeEvent = threading.Event()
+
+def publish(feed, snapshot, updated=()):
+    """Swap in a new snapshot and its serialized body, and record it in the history."""
+    body = wire.encode(viewOf(snapshot, None), wire.JSON)
+    now, values = time.time(), history.metricValues(snapshot)
+    feed["history"].append(now, values)
+    if feed["store"] is not None:
+        feed["store"].append(now, values)
+    with feed["cond"]:
+        feed["snapshot"] = snapshot
+        feed["seq"] += 1
+        feed["recent"][feed["seq"]] = snapshot
+        while len(feed["recent"]) > PATCH_HISTORY:
+            feed["recent"].popitem(last=False)
+        feed["bodies"] = {(None, None, wire.JSON, "identity"): (body, "identity")}
+        feed["online"] = True
+        now = time.monotonic()
+        for name in updated:
+            collectors[name]["updated"] = now
+        feed["cond"].notify_all()
+
+
+def setOffline(feed):
+    """Mark a relayed feed as unreachable, ending its streams."""
+    with feed["cond"]:
+        feed["online"] = False
+        feed["cond"].notify_all()
+
+
+def viewOf(snapshot, fields):
+    """Limit a snapshot to the selected fields, _meta is only included when asked for."""
+    if fields is None:
+        if META_FIELD not in snapshot:
+            return snapshot
+        return {name: value for name, value in snapshot.items() if name != META_FIELD}
+    return {name: snapshot[name] for name in fields if name in snapshot}
+
+
+def snapshotFor(feed, fields, since=None, fmt=wire.JSON, encoding="identity"):
+    """Return (seq, base, body, encoding) for a feed's current snapshot limited to fields.
 
-    # Other
-    pc["bootTime"] = psutil.boot_time()
-    pc["processes"] = getProcessInfo()
+    If since is a recent seq the body is a merge patch from that snapshot and
+    base is since, otherwise it's the full document and base is None. Bodies
+    are serialized as fmt and compressed with encoding unless they are small.
+    """
+    with feed["cond"]:
+        if since not in feed["recent"]:
+            since = None
+        bodies = feed["bodies"]
+        key = (fields, since, fmt, encoding)
+        cached = bodies.get(key)
+        if cached is None:
+            plain = bodies.get((fields, since, fmt, "identity"))
+            if plain is None:
+                current = viewOf(feed["snapshot"], fields)
+                if since is None:
+                    document = current
+                else:
+                    document = wire.makePatch(viewOf(feed["recent"][since], fields), current)
+                plain = (wire.encode(document, fmt), "identity")
+                bodies[(fields, since, fmt, "identity")] = plain
+            if encoding == "identity" or len(plain[0]) < COMPRESS_MIN_SIZE:
+                cached = plain
+            else:
+                cached = (compress(plain[0], encoding), encoding)
+            bodies[key] = cached
+        return (feed["seq"], since) + cached
+
+
+def compress(body, encoding):
+    """Compress a whole body."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def streamCompressor(encoding):
+    """Return a function compressing stream messages so each one can be decoded on arrival."""
+    if encoding == "zstd":
+        compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        return lambda data: compressor.compress(data) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+    if encoding == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        return lambda data: compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    return lambda data: data
+
+
+# Prometheus exposition, every fixed line is laid out once at import
+PROM_SCALARS = (  # (name, type, help, section, key) of single-sample metrics
+    ("richmonitor_cpu_usage_percent", "gauge", "CPU usage across all cores.", "cpu", "percent"),
+    ("richmonitor_cpu_frequency_mhz", "gauge", "Current CPU clock.", "cpu", "freq"),
+    ("richmonitor_cpu_max_frequency_mhz", "gauge", "Maximum CPU clock.", "cpu", "maxFreq"),
+    ("richmonitor_cpu_temperature_celsius", "gauge", "CPU package temperature.", "cpu", "temp"),
+    ("richmonitor_cpu_cores", "gauge", "Physical CPU cores.", "cpu", "cores"),
+    ("richmonitor_cpu_threads", "gauge", "Logical CPU threads.", "cpu", "threads"),
+    ("richmonitor_memory_total_bytes", "gauge", "Installed RAM.", "mem", "total"),
+    ("richmonitor_memory_available_bytes", "gauge", "RAM available to new processes.", "mem", "available"),
+    ("richmonitor_memory_used_bytes", "gauge", "RAM in use.", "mem", "used"),
+    ("richmonitor_memory_usage_percent", "gauge", "RAM usage.", "mem", "percent"),
+    ("richmonitor_network_sent_bytes_total", "counter", "Bytes sent on all interfaces.", "network", "sent"),
+    ("richmonitor_network_received_bytes_total", "counter", "Bytes received on all interfaces.", "network", "recv"),
+    ("richmonitor_network_send_rate_bytes", "gauge", "Bytes sent per second.", "network", "sentPerSec"),
+    ("richmonitor_network_receive_rate_bytes", "gauge", "Bytes received per second.", "network", "recvPerSec"),
+    ("richmonitor_gpu_usage_percent", "gauge", "GPU load.", "gpu", "percent"),
+    ("richmonitor_gpu_temperature_celsius", "gauge", "GPU temperature.", "gpu", "temp"),
+    ("richmonitor_gpu_memory_used_bytes", "gauge", "GPU memory in use.", "gpu", "memUsed"),
+    ("richmonitor_gpu_memory_free_bytes", "gauge", "GPU memory free.", "gpu", "memFree"),
+)
+PROM_SCALAR_LINES = tuple(  # (section, key, header and sample line) per single-sample metric
+    (section, key, f"# HELP {name} {text}\n# TYPE {name} {kind}\n{name} {{}}\n") for name, kind, text, section, key in PROM_SCALARS
+)
+PROM_BOOT_TIME_LINE = "# HELP richmonitor_boot_time_seconds Unix time the machine booted.\n# TYPE richmonitor_boot_time_seconds gauge\nrichmonitor_boot_time_seconds {}\n"
+PROM_STORAGE = (  # (name, help, key) per mount
+    ("richmonitor_storage_total_bytes", "Size of the filesystem.", "total"),
+    ("richmonitor_storage_used_bytes", "Space used on the filesystem.", "used"),
+    ("richmonitor_storage_free_bytes", "Space free on the filesystem.", "free"),
+    ("richmonitor_storage_usage_percent", "Filesystem usage.", "percent"),
+)
+PROM_PROCESSES = (  # (name, help, key) per top process
+    ("richmonitor_process_cpu_percent", "CPU usage of a top process.", "cpuPer"),
+    ("richmonitor_process_memory_percent", "Memory usage of a top process.", "memPer"),
+)
+PROM_GROUPS = (  # (name, help, key) per process name in byName
+    ("richmonitor_process_group_count", "Running processes with this name.", "count"),
+    ("richmonitor_process_group_cpu_percent", "CPU usage summed over processes with this name.", "cpuPer"),
+    ("richmonitor_process_group_memory_percent", "Memory usage summed over processes with this name.", "memPer"),
+)
+PROM_DEVICES = (  # (name, type, help, section, subsection, label, key) per interface and disk
+    ("richmonitor_network_interface_sent_bytes_total", "counter", "Bytes sent on one interface.", "network", "interfaces", "interface", "sent"),
+    ("richmonitor_network_interface_received_bytes_total", "counter", "Bytes received on one interface.", "network", "interfaces", "interface", "recv"),
+    ("richmonitor_network_interface_send_rate_bytes", "gauge", "Bytes sent per second on one interface.", "network", "interfaces", "interface", "sentPerSec"),
+    ("richmonitor_network_interface_receive_rate_bytes", "gauge", "Bytes received per second on one interface.", "network", "interfaces", "interface", "recvPerSec"),
+    ("richmonitor_disk_read_bytes_total", "counter", "Bytes read from one disk.", "disk", None, "disk", "readBytes"),
+    ("richmonitor_disk_written_bytes_total", "counter", "Bytes written to one disk.", "disk", None, "disk", "writeBytes"),
+    ("richmonitor_disk_read_rate_bytes", "gauge", "Bytes read per second from one disk.", "disk", None, "disk", "readPerSec"),
+    ("richmonitor_disk_write_rate_bytes", "gauge", "Bytes written per second to one disk.", "disk", None, "disk", "writePerSec"),
+    ("richmonitor_disk_read_iops", "gauge", "Reads per second from one disk.", "disk", None, "disk", "readIops"),
+    ("richmonitor_disk_write_iops", "gauge", "Writes per second to one disk.", "disk", None, "disk", "writeIops"),
+)
+PROM_GPUS = (  # (name, help, key) per GPU card
+    ("richmonitor_gpu_card_usage_percent", "Load of one GPU.", "percent"),
+    ("richmonitor_gpu_card_temperature_celsius", "Temperature of one GPU.", "temp"),
+    ("richmonitor_gpu_card_memory_total_bytes", "Memory of one GPU.", "memTotal"),
+    ("richmonitor_gpu_card_memory_used_bytes", "Memory in use on one GPU.", "memUsed"),
+    ("richmonitor_gpu_card_memory_free_bytes", "Memory free on one GPU.", "memFree"),
+)
+PROM_HEADER = "# HELP {0} {1}\n# TYPE {0} {2}\n"
+PROM_STORAGE_LINE = '{}{{mount="{}",device="{}",fstype="{}"}} {}\n'
+PROM_PROCESS_LINE = '{}{{list="{}",rank="{}",pid="{}",name="{}"}} {}\n'
+PROM_GROUP_LINE = '{}{{name="{}"}} {}\n'
+PROM_DEVICE_LINE = '{}{{{}="{}"}} {}\n'
+PROM_CORE_HEADER = PROM_HEADER.format("richmonitor_cpu_core_usage_percent", "Usage of one logical CPU.", "gauge")
+PROM_CORE_LINE = 'richmonitor_cpu_core_usage_percent{{core="{}"}} {}\n'
+PROM_GPU_LINE = '{}{{gpu="{}",name="{}"}} {}\n'
+PROM_BUCKET_LINE = 'richmonitor_collector_duration_seconds_bucket{{step="{}",le="{}"}} {}\n'
+PROM_SUM_LINE = (
+    'richmonitor_collector_duration_seconds_sum{{step="{0}"}} {1}\n'
+    'richmonitor_collector_duration_seconds_count{{step="{0}"}} {2}\n'
+)
+PROM_DURATION_HEADER = PROM_HEADER.format("richmonitor_collector_duration_seconds", "Time spent in a collector or one of its steps.", "histogram")
+PROM_ERRORS_HEADER = PROM_HEADER.format("richmonitor_collector_errors_total", "Runs of a collector or step that raised.", "counter")
+PROM_TIMEOUTS_HEADER = PROM_HEADER.format("richmonitor_collector_timeouts_total", "Ticks published without a collector that ran too long.", "counter")
+PROM_ERRORS_LINE = 'richmonitor_collector_errors_total{{step="{}"}} {}\n'
+PROM_TIMEOUTS_LINE = 'richmonitor_collector_timeouts_total{{step="{}"}} {}\n'
+PROM_LE = [repr(bound) for bound in TIMING_BUCKETS] + ["+Inf"]
+
+
+def promValue(value):
+    """Sample value in exposition syntax, missing values are NaN."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return "NaN"
+    return repr(value)
+
+
+def promLabel(value):
+    """Escape a label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def renderMetrics(snapshot, withTimings):
+    """Prometheus text exposition of a snapshot, plus the collector histograms.
+
+    Sections missing from the snapshot export no samples.
+    """
+    parts = [line.format(promValue(snapshot[section].get(key))) for section, key, line in PROM_SCALAR_LINES if snapshot.get(section)]
+    if "bootTime" in snapshot:
+        parts.append(PROM_BOOT_TIME_LINE.format(promValue(snapshot["bootTime"])))
+
+    storage = snapshot.get("storage") or {}
+    mounts = [(promLabel(mount), promLabel(disk.get("device", "")), promLabel(disk.get("fstype", "")), disk) for mount, disk in storage.items()]
+    for name, text, key in PROM_STORAGE:
+        parts.append(PROM_HEADER.format(name, text, "gauge"))
+        parts.extend(PROM_STORAGE_LINE.format(name, mount, device, fstype, promValue(disk.get(key))) for mount, device, fstype, disk in mounts)
+
+    parts.append(PROM_CORE_HEADER)
+    parts.extend(PROM_CORE_LINE.format(core, promValue(usage)) for core, usage in enumerate((snapshot.get("cpu") or {}).get("perCore") or ()))
+    for name, kind, text, section, subsection, label, key in PROM_DEVICES:
+        devices = snapshot.get(section) or {}
+        if subsection:
+            devices = devices.get(subsection) or {}
+        parts.append(PROM_HEADER.format(name, text, kind))
+        parts.extend(PROM_DEVICE_LINE.format(name, label, promLabel(device), promValue(values.get(key))) for device, values in devices.items())
+
+    cards = [(card.get("index"), promLabel(card.get("name", "")), card) for card in (snapshot.get("gpu") or {}).get("cards") or ()]
+    for name, text, key in PROM_GPUS:
+        parts.append(PROM_HEADER.format(name, text, "gauge"))
+        parts.extend(PROM_GPU_LINE.format(name, index, cardName, promValue(card.get(key))) for index, cardName, card in cards)
+
+    processes = snapshot.get("processes") or {}
+    tops = [(listName, rank, proc.get("pid"), promLabel(proc.get("name", "")), proc)
+            for listName in ("cpuTop", "memTop") for rank, proc in (processes.get(listName) or {}).items()]
+    for name, text, key in PROM_PROCESSES:
+        parts.append(PROM_HEADER.format(name, text, "gauge"))
+        parts.extend(PROM_PROCESS_LINE.format(name, listName, rank, pid, procName, promValue(proc.get(key))) for listName, rank, pid, procName, proc in tops)
+    groups = [(promLabel(procName), group) for procName, group in (processes.get("byName") or {}).items()]
+    for name, text, key in PROM_GROUPS:
+        parts.append(PROM_HEADER.format(name, text, "gauge"))
+        parts.extend(PROM_GROUP_LINE.format(name, procName, promValue(group.get(key))) for procName, group in groups)
+
+    if withTimings:
+        with timingsLock:
+            steps = sorted(timings.items())
+            # Samples of one family have to stay together
+            parts.append(PROM_DURATION_HEADER)
+            for step, timing in steps:
+                cumulative = 0
+                for le, count in zip(PROM_LE, timing["buckets"]):
+                    cumulative += count
+                    parts.append(PROM_BUCKET_LINE.format(step, le, cumulative))
+                parts.append(PROM_SUM_LINE.format(step, repr(timing["total"]), timing["count"]))
+            parts.append(PROM_ERRORS_HEADER)
+            parts.extend(PROM_ERRORS_LINE.format(step, timing["errors"]) for step, timing in steps)
+            parts.append(PROM_TIMEOUTS_HEADER)
+            parts.extend(PROM_TIMEOUTS_LINE.format(step, timing["timeouts"]) for step, timing in steps)
+    return "".join(parts).encode()
+
+
+def metricsFor(feed):
+    """The feed's current snapshot as Prometheus text, rendered once per seq.
+
+    Locally, sections whose collector hasn't published yet still hold the
+    placeholder zeros and are left out.
+    """
+    with feed["cond"]:
+        key = (None, None, PROMETHEUS, "identity")
+        cached = feed["bodies"].get(key)
+        if cached is None:
+            snapshot = feed["snapshot"]
+            if feed is localFeed:
+                snapshot = {name: value for name, value in snapshot.items() if name in collectors and collectors[name]["updated"] is not None}
+            cached = feed["bodies"][key] = (renderMetrics(snapshot, feed is localFeed), "identity")
+        return cached[0]
+
+
+def parseFields(raw):
+    """Parse a ?fields=cpu,mem list into a sorted tuple, None means everything."""
+    if not raw:
+        return None
+    fields = tuple(sorted({name.strip() for name in raw.split(",") if name.strip()}))
+    unknown = [name for name in fields if name not in collectors and name != META_FIELD]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return fields
+
+
+def wantFields(feed, fields, hold=DEMAND_TIMEOUT, wait=True):
+    """Mark fields as wanted for hold seconds, waiting for any that had gone idle to be collected."""
+    if feed is not localFeed:
+        # Relayed feeds are collected by their own server
+        return
+    now = time.monotonic()
+    stale = []
+    for name in fields or collectors:
+        entry = collectors.get(name)
+        if entry is None:
+            continue
+        if not isWanted(entry, now):
+            entry["lastRun"] = None
+            stale.append(entry)
+        entry["wantedUntil"] = max(entry["wantedUntil"] or now, now + hold)
+
+    if stale:
+        wakeEvent.set()
+        if not wait:
+            return
+        timeout = max(entry["timeout"] for entry in stale) + SAMPLE_INTERVAL
+        with feed["cond"]:
+            feed["cond"].wait_for(lambda: all(e["updated"] is not None and e["updated"] >= now for e in stale), timeout)
+
+
+def samplerDaemon():
+    """Daemon for running due collectors and merging them into the snapshot."""
+    nextTick = time.monotonic()
+    while True:
+        with timed("tick"):
+            results = collectTick()
+        if results:
+            snapshot = dict(localFeed["snapshot"])
+            snapshot.update(results)
+            snapshot[META_FIELD] = {"timings": timingSummary()}
+            with timed("publish"):
+                publish(localFeed, snapshot, results)
+
+        # Ticks missed by a slow collection are skipped, not caught up
+        now = time.monotonic()
+        while nextTick <= now:
+            nextTick += SAMPLE_INTERVAL
+        # Woken early when a request wants a field that went idle
+        if wakeEvent.wait(nextTick - now):
+            wakeEvent.clear()
+
+
+def startSampler():
+    """Start the background sampler once."""
+    global samplerThread, collectorPool
+    if samplerThread is None:
+        # Subsystems recorded in the history are collected even when nobody is watching
+        for section, _ in history.METRICS.values():
+            collectors[section]["pinned"] = True
+        collectorPool = concurrent.futures.ThreadPoolExecutor(max_workers=len(collectors), thread_name_prefix="collector")
+        samplerThread = threading.Thread(target=samplerDaemon, daemon=True)
+        samplerThread.start()
+
+
+def relayDaemon(name, url):
+    """Daemon mirroring one upstream server's stream into its feed."""
+    import requests  # Only relays talk to other servers
+
+    feed = relayFeeds[name]
+    session = requests.Session()
+    lastId, snapshot = None, None
+    backoff = 1
+    while True:
+        try:
+            # The full document, so downstream clients can pick any fields
+            for lastId, snapshot in wire.followStream(session, url, lastId, snapshot, timeout=(RELAY_CONNECT_TIMEOUT, RELAY_STREAM_TIMEOUT)):
+                publish(feed, snapshot)
+                backoff = 1
+        except (requests.RequestException, ValueError) as e:
+            print(f"Relay {name} ({url}) failed: {e!r}")
+        setOffline(feed)
+        time.sleep(backoff)
+        backoff = min(backoff * 2, RELAY_MAX_BACKOFF)
+
+
+def startRelay(upstreams):
+    """Relay NAME=URL upstream servers instead of collecting locally."""
+    for upstream in upstreams:
+        name, _, url = upstream.rpartition("=")
+        url = url.rstrip("/")
+        name = name or url.split("://")[-1].split(":")[0]
+        feed = newFeed({})
+        feed["online"] = False
+        relayFeeds[name] = feed
+        threading.Thread(target=relayDaemon, args=(name, url), daemon=True).start()
+
+
+def openStores(directory):
+    """Persist every feed's metrics under directory, one subdirectory per relayed host."""
+    import store  # Only needed with --store
+
+    localFeed["store"] = store.MetricStore(directory, history.METRICS)
+    for name, feed in relayFeeds.items():
+        feed["store"] = store.MetricStore(os.path.join(directory, name), history.METRICS)
+
+
+def defaultFeed():
+    """The local machine, or the first upstream when relaying."""
+    return next(iter(relayFeeds.values())) if relayFeeds else localFeed
+
+
+def errorResponse(status, message):
+    """Small JSON error body."""
+    return Response(json.dumps({"error": message}), status=status, mimetype="application/json")
+
+
+def serveSnapshot(feed):
+    """Answer a snapshot request from a feed's cache."""
+    try:
+        fields = parseFields(request.args.get("fields"))
+    except ValueError as e:
+        return errorResponse(400, str(e))
+    wantFields(feed, fields)
+    if not feed["online"]:
+        return errorResponse(503, "Upstream server is offline")
+    fmt = wire.negotiate(request.headers.get("Accept"))
+    encoding = wire.negotiate(request.headers.get("Accept-Encoding"), ENCODINGS, "identity")
+    seq, base, body, encoding = snapshotFor(feed, fields, request.args.get("since", type=int), fmt, encoding)
+    etag = f'"{seq}"'
+    headers = {"ETag": etag, "X-Snapshot-Seq": str(seq), "Cache-Control": "no-cache", "Vary": "Accept, Accept-Encoding"}
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    if base is not None:
+        # Only what changed since the client's snapshot
+        headers["X-Patch-Base"] = str(base)
+        if fmt == wire.JSON:
+            return Response(body, mimetype="application/merge-patch+json", headers=headers)
+    return Response(body, mimetype=fmt, headers=headers)
+
+
+def serveStream(feed):
+    """Stream a feed, a full snapshot then merge patches as it changes."""
+    try:
+        fields = parseFields(request.args.get("fields"))
+    except ValueError as e:
+        return errorResponse(400, str(e))
+    wantFields(feed, fields)
+    if not feed["online"]:
+        return errorResponse(503, "Upstream server is offline")
+    fmt = wire.negotiate(request.headers.get("Accept"))
+    encoding = wire.negotiate(request.headers.get("Accept-Encoding"), ENCODINGS, "identity")
+    emptyPatch = wire.encode({}, fmt)
+    try:
+        # A reconnecting client resumes with a patch from its last event
+        sentSeq = int(request.headers.get("Last-Event-ID", ""))
+    except ValueError:
+        sentSeq = None
+
+    def events():
+        nonlocal sentSeq
+        # One compression context per stream, flushed after every message
+        squeeze = streamCompressor(encoding)
+        lastSeq = None
+        lastSent = time.monotonic()
+        while True:
+            with feed["cond"]:
+                feed["cond"].wait_for(lambda: feed["seq"] != lastSeq or not feed["online"], STREAM_HEARTBEAT)
+            if not feed["online"]:
+                # Closing tells downstream clients the machine is gone
+                return
+            # An open stream keeps its fields wanted
+            wantFields(feed, fields)
+            lastSeq, base, body, _ = snapshotFor(feed, fields, sentSeq, fmt)
+            if base is None:
+                sentSeq, lastSent = lastSeq, time.monotonic()
+                yield squeeze(wire.frame("snapshot", lastSeq, body, fmt))
+            elif body != emptyPatch:
+                sentSeq, lastSent = lastSeq, time.monotonic()
+                yield squeeze(wire.frame("patch", lastSeq, body, fmt))
+            elif time.monotonic() - lastSent >= STREAM_HEARTBEAT:
+                lastSent = time.monotonic()
+                yield squeeze(wire.heartbeat(fmt))
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Vary": "Accept, Accept-Encoding"}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(events(), mimetype=wire.streamType(fmt), headers=headers)
+
+
+def serveHistory(feed):
+    """Downsampled series of one metric over the last ?window= seconds.
+
+    Windows reaching past the in-memory history are served from the on-disk
+    store when it holds older samples, at the finest resolution that still
+    covers them.
+    """
+    metric = request.args.get("metric")
+    if not metric:
+        return Response(json.dumps({"metrics": list(history.METRICS)}), mimetype="application/json")
+    if metric not in history.METRICS:
+        return errorResponse(400, f"Unknown metric: {metric}")
+    mode = request.args.get("mode", "minmax")
+    if mode not in ("minmax", "lttb"):
+        return errorResponse(400, f"Unknown mode: {mode}")
+    window = request.args.get("window", default=3600.0, type=float)
+    points = max(1, min(request.args.get("points", default=300, type=int), MAX_HISTORY_POINTS))
+
+    end = time.time()
+    start = end - window
+    oldest = feed["history"].oldest()
+    stored = feed["store"].oldest() if feed["store"] is not None else None
+    # The store only answers windows the in-memory history can't, by reaching further back
+    if stored is not None and (oldest is None or (start < oldest and stored < oldest)):
+        resolution, times, mins, maxs, values = feed["store"].query(metric, start, end, step=window / points)
+    else:
+        resolution = SAMPLE_INTERVAL
+        times, values = feed["history"].series(metric, start, end)
+        mins = maxs = values
+    if mode == "lttb":
+        data = history.lttb(times, values, points)  # [t, value]
+    else:
+        data = history.minMaxBuckets(times, mins, points, maxs)  # [t, min, max]
+    document = {"metric": metric, "mode": mode, "window": window, "resolution": resolution, "points": data}
+    return Response(json.dumps(document, separators=(",", ":")), mimetype="application/json")
 
 
 @app.route("/")
 def stats():
-    pcCollector()
-    return jsonify(pc)
+    return serveSnapshot(defaultFeed())
+
+
+@app.route("/stream")
+def stream():
+    """Server-Sent Events (or msgpack) stream of snapshots."""
+    return serveStream(defaultFeed())
+
+
+@app.route("/history")
+def metricHistory():
+    return serveHistory(defaultFeed())
+
+
+@app.route("/metrics")
+def prometheusMetrics():
+    """Prometheus scrape target, served from the cached snapshot without collecting.
+
+    A scrape only keeps every collector running in the background, so the
+    next one finds fresh values without waiting for them.
+    """
+    feed = defaultFeed()
+    wantFields(feed, None, SCRAPE_HOLD, wait=False)
+    return Response(metricsFor(feed), content_type=PROMETHEUS)
+
+
+@app.route("/debug/timings")
+def debugTimings():
+    """Latency histograms, error and timeout counts of every collector and timed step."""
+    document = {"bucketsSeconds": list(TIMING_BUCKETS) + ["+Inf"], "timings": timingReport()}
+    return Response(json.dumps(document), mimetype="application/json")
+
+
+@app.route("/hosts")
+def hostList():
+    """Relayed machines and whether they are reachable."""
+    hosts = {name: {"online": feed["online"], "seq": feed["seq"]} for name, feed in relayFeeds.items()}
+    return Response(json.dumps({"hosts": hosts}), mimetype="application/json")
+
+
+@app.route("/hosts/<name>/", strict_slashes=False)
+def hostStats(name):
+    if name not in relayFeeds:
+        return errorResponse(404, f"Unknown host: {name}")
+    return serveSnapshot(relayFeeds[name])
+
+
+@app.route("/hosts/<name>/stream")
+def hostStream(name):
+    if name not in relayFeeds:
+        return errorResponse(404, f"Unknown host: {name}")
+    return serveStream(relayFeeds[name])
+
+
+@app.route("/hosts/<name>/metrics")
+def hostMetrics(name):
+    if name not in relayFeeds:
+        return errorResponse(404, f"Unknown host: {name}")
+    return Response(metricsFor(relayFeeds[name]), content_type=PROMETHEUS)
+
+
+@app.route("/hosts/<name>/history")
+def hostHistory(name):
+    if name not in relayFeeds:
+        return errorResponse(404, f"Unknown host: {name}")
+    return serveHistory(relayFeeds[name])
 
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Serve this PC's metrics, or relay other servers.")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=5000, help="Port to listen on")
+    parser.add_argument("--relay", nargs="+", metavar="NAME=URL", help="Relay these servers instead of collecting locally")
+    parser.add_argument("--store", metavar="DIR", help="Also keep metric history on disk in this directory")
+    parser.add_argument("--top-k", type=int, default=TOP_K, help="Processes listed by CPU and by memory")
+    parser.add_argument("--gpu", default=GPU_BACKEND, metavar="BACKEND", help="GPU backend: auto, nvml, gputil, fake[:N] or none")
+    args = parser.parse_args()
+    TOP_K = max(1, args.top_k)
+
+    if args.relay:
+        startRelay(args.relay)
+    if args.store:
+        openStores(args.store)
+    if not args.relay:
+        gpuBackend = gpu.openBackend(args.gpu)
+        startSampler()
+    # threaded (the default) is required, every open stream holds a worker thread
+    app.run(host=args.host, port=args.port, threaded=True)
@@ -0,0 +1,293 @@
+"""Append-only on-disk metric store with 1s -> 1m -> 1h rollups, read through mmap."""
+import array
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+
+NAN = float("nan")
+MAGIC = b"RMTS"
+VERSION = 1
+HEADER_SIZE = 4096  # Records start on a page boundary
+HEADER = struct.Struct("<4sHHIIQ")  # magic, version, stats per metric, resolution, capacity, written
+WRITTEN_OFFSET = 16  # Offset of the written counter inside HEADER
+FLUSH_EVERY = 60  # Appends between msyncs of the raw file
+
+# Resolution in seconds -> how long records of that resolution are kept
+RETENTION = {
+    1: 7 * 86400,
+    60: 90 * 86400,
+    3600: 2 * 365 * 86400,
+}
+
+
+def _float(value):
+    """Metric value as a float, None and non-numbers become NaN."""
+    return float(value) if isinstance(value, (int, float)) else NAN
+
+
+class RingFile:
+    """Preallocated circular file of fixed-size records behind a small header.
+
+    Raw files hold one float32 per metric, rollup files hold min, max and avg.
+    Every record starts with a float64 timestamp and records are written in
+    timestamp order, so any range is found with a binary search over the map.
+    """
+
+    def __init__(self, path, metrics, resolution, capacity, stats):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.stats = stats
+        self.record = struct.Struct(f"<d{len(metrics) * stats}f")
+        names = json.dumps(metrics).encode()
+        header = HEADER.pack(MAGIC, VERSION, stats, resolution, capacity, 0) + struct.pack("<I", len(names)) + names
+        if len(header) > HEADER_SIZE:
+            raise ValueError("Too many metrics for the store header")
+        size = HEADER_SIZE + capacity * self.record.size
+
+        self.file = open(path, "r+b" if os.path.exists(path) else "w+b")
+        current = self.file.read(len(header))
+        # A file written with another layout is started over rather than misread
+        reuse = (len(current) == len(header) and current[:WRITTEN_OFFSET] == header[:WRITTEN_OFFSET]
+                 and current[HEADER.size:] == header[HEADER.size:] and os.path.getsize(path) == size)
+        if not reuse:
+            self.file.seek(0)
+            self.file.truncate(0)
+            self.file.truncate(size)
+            self.file.write(header)
+            self.file.flush()
+        self.mm = mmap.mmap(self.file.fileno(), size)
+        self.written = struct.unpack_from("<Q", self.mm, WRITTEN_OFFSET)[0]
+
+    @property
+    def count(self):
+        return min(self.written, self.capacity)
+
+    def _offset(self, position):
+        """Byte offset of a logical position, 0 being the oldest record kept."""
+        return HEADER_SIZE + ((self.written - self.count + position) % self.capacity) * self.record.size
+
+    def append(self, timestamp, values):
+        """Write one record over the oldest, then publish it by bumping the counter."""
+        slot = self.written % self.capacity
+        self.record.pack_into(self.mm, HEADER_SIZE + slot * self.record.size, timestamp, *values)
+        self.written += 1
+        struct.pack_into("<Q", self.mm, WRITTEN_OFFSET, self.written)
+
+    def timeAt(self, position):
+        return struct.unpack_from("<d", self.mm, self._offset(position))[0]
+
+    def first(self):
+        return self.timeAt(0) if self.count else None
+
+    def last(self):
+        return self.timeAt(self.count - 1) if self.count else None
+
+    def search(self, timestamp, inclusive):
+        """First logical position after the records before (or at) timestamp."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            t = self.timeAt(mid)
+            if t < timestamp or (inclusive and t == timestamp):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _segments(self, lo, hi):
+        """Physical (offset, records) runs covering logical lo..hi, at most two."""
+        if hi <= lo:
+            return []
+        start = self._offset(lo)
+        first = min(hi - lo, (HEADER_SIZE + self.capacity * self.record.size - start) // self.record.size)
+        runs = [(start, first)]
+        if first < hi - lo:
+            runs.append((HEADER_SIZE, hi - lo - first))
+        return runs
+
+    def column(self, lo, hi, field, typecode):
+        """One field of records lo..hi as an array, gathered with strided slices.
+
+        Each byte of the field is copied for all records with a single C-level
+        step slice, so only the requested column is ever touched.
+        """
+        width = struct.calcsize(typecode)
+        offset = 0 if field < 0 else 8 + 4 * field
+        result = array.array(typecode)
+        size = self.record.size
+        for start, records in self._segments(lo, hi):
+            buffer = bytearray(records * width)
+            base = start + offset
+            for byte in range(width):
+                buffer[byte::width] = self.mm[base + byte:base + records * size:size]
+            result.frombytes(buffer)
+        return result
+
+    def rows(self, lo, hi):
+        """Fully decoded records lo..hi, for the handful needed to resume rollups."""
+        result = []
+        for start, records in self._segments(lo, hi):
+            result.extend(self.record.iter_unpack(self.mm[start:start + records * self.record.size]))
+        return result
+
+    def flush(self):
+        self.mm.flush()
+
+    def close(self):
+        self.mm.flush()
+        self.mm.close()
+        self.file.close()
+
+
+class MetricStore:
+    """Raw samples of a fixed set of metrics plus coarser min/max/avg rollups.
+
+    Each resolution lives in its own ring file sized from its retention, so
+    disk use is fixed up front and old data ages out on its own. Rollups are
+    accumulated in memory and written when their bucket closes; a reopened
+    store rebuilds the open buckets from the finer file.
+    """
+
+    def __init__(self, directory, metrics, retention=RETENTION):
+        os.makedirs(directory, exist_ok=True)
+        self.metrics = list(metrics)
+        self.index = {name: i for i, name in enumerate(self.metrics)}
+        self.levels = []
+        for resolution, keep in sorted(retention.items()):
+            path = os.path.join(directory, f"metrics-{resolution}s.bin")
+            stats = 1 if not self.levels else 3
+            self.levels.append(RingFile(path, self.metrics, resolution, max(1, keep // resolution), stats))
+        self.pending = [None] * len(self.levels)  # Open bucket per rollup level
+        self.appends = 0
+        self.lock = threading.Lock()
+        for level in range(1, len(self.levels)):
+            self._resume(level)
+
+    def append(self, timestamp, values):
+        """Record one sample; samples not newer than the last one are dropped."""
+        row = [_float(values.get(name)) for name in self.metrics]
+        with self.lock:
+            raw = self.levels[0]
+            last = raw.last()
+            # Clock steps backwards (an RTC-less Pi before NTP) would break ordering
+            if last is not None and timestamp <= last:
+                return False
+            raw.append(timestamp, row)
+            self._fold(1, timestamp, row, row, row)
+            self.appends += 1
+            if self.appends % FLUSH_EVERY == 0:
+                raw.flush()
+        return True
+
+    def _fold(self, level, timestamp, mins, maxs, avgs):
+        """Add a sample or finished bucket to the open bucket of level."""
+        if level >= len(self.levels):
+            return
+        resolution = self.levels[level].resolution
+        bucket = timestamp // resolution * resolution
+        acc = self.pending[level]
+        if acc is not None and acc["bucket"] != bucket:
+            self._close(level)
+            acc = None
+        if acc is None:
+            n = len(self.metrics)
+            acc = self.pending[level] = {
+                "bucket": bucket, "min": [math.inf] * n, "max": [-math.inf] * n, "sum": [0.0] * n, "count": [0] * n,
+            }
+        for i, value in enumerate(avgs):
+            if value == value:
+                acc["min"][i] = min(acc["min"][i], mins[i])
+                acc["max"][i] = max(acc["max"][i], maxs[i])
+                acc["sum"][i] += value
+                acc["count"][i] += 1
+
+    def _close(self, level):
+        """Write the open bucket of level and pass it on to the next coarser one."""
+        acc = self.pending[level]
+        self.pending[level] = None
+        mins, maxs, avgs = [], [], []
+        for i, count in enumerate(acc["count"]):
+            mins.append(acc["min"][i] if count else NAN)
+            maxs.append(acc["max"][i] if count else NAN)
+            avgs.append(acc["sum"][i] / count if count else NAN)
+        ring = self.levels[level]
+        if ring.last() is None or acc["bucket"] > ring.last():
+            ring.append(acc["bucket"], mins + maxs + avgs)
+            ring.flush()
+        self._fold(level + 1, acc["bucket"], mins, maxs, avgs)
+
+    def _resume(self, level):
+        """Rebuild the open bucket of level from the finer records already on disk."""
+        source = self.levels[level - 1]
+        last = source.last()
+        if last is None:
+            return
+        resolution = self.levels[level].resolution
+        lo = source.search(last // resolution * resolution, False)
+        n = len(self.metrics)
+        for record in source.rows(lo, source.count):
+            timestamp, values = record[0], record[1:]
+            if source.stats == 1:
+                self._fold(level, timestamp, values, values, values)
+            else:
+                self._fold(level, timestamp, values[:n], values[n:2 * n], values[2 * n:])
+
+    def _oldest(self):
+        """See oldest, with the lock held."""
+        # A rollup's first bucket may hold only its last seconds, so it only counts from the bucket's end
+        reach = [ring.first() + (ring.resolution if level else 0) for level, ring in enumerate(self.levels) if ring.count]
+        return min(reach) if reach else None
+
+    def oldest(self):
+        """Timestamp the stored data reaches back to at any resolution, None while empty."""
+        with self.lock:
+            return self._oldest()
+
+    def levelFor(self, start, step=0):
+        """Resolution to answer from: the coarsest one no coarser than step that
+        still reaches back to start, else the finest that does.
+
+        A start before anything stored is clamped to the oldest data first, so
+        a store younger than the window isn't answered from its coarsest file.
+        """
+        with self.lock:
+            oldest = self._oldest()
+            if oldest is not None:
+                start = max(start, oldest)
+            covering = [ring.resolution for ring in self.levels if ring.count and ring.first() <= start]
+            populated = [ring.resolution for ring in self.levels if ring.count]
+        if not covering:
+            # Resolutions are sorted finest first
+            covering = populated or [self.levels[0].resolution]
+        fitting = [resolution for resolution in covering if resolution <= step]
+        return fitting[-1] if fitting else covering[0]
+
+    def query(self, metric, start, end, resolution=None, step=0):
+        """(resolution, times, mins, maxs, avgs) of one metric for start <= t <= end.
+
+        Without a resolution one is picked by levelFor(start, step), so callers
+        downsampling anyway pass their bucket width and skip reading raw data.
+        Raw samples return the same array for mins, maxs and avgs.
+        """
+        field = self.index[metric]
+        if resolution is None:
+            resolution = self.levelFor(start, step)
+        ring = next(ring for ring in self.levels if ring.resolution == resolution)
+        n = len(self.metrics)
+        with self.lock:
+            lo = ring.search(start, False)
+            hi = ring.search(end, True)
+            times = ring.column(lo, hi, -1, "d")
+            if ring.stats == 1:
+                values = ring.column(lo, hi, field, "f")
+                return resolution, times, values, values, values
+            return (resolution, times, ring.column(lo, hi, field, "f"),
+                    ring.column(lo, hi, n + field, "f"), ring.column(lo, hi, 2 * n + field, "f"))
+
+    def close(self):
+        with self.lock:
+            for ring in self.levels:
+                ring.close()
@@ -0,0 +1,27 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import history
+
+
+def series(n):
+    return [float(t) for t in range(n)], [float(t % 7) for t in range(n)]
+
+
+def test_lttb_keeps_every_point_when_asked_for_as_many():
+    times, values = series(5)
+    assert history.lttb(times, values, 5) == [[t, v] for t, v in zip(times, values)]
+
+
+def test_lttb_keeps_the_ends_below_three_points():
+    times, values = series(100)
+    assert history.lttb(times, values, 2) == [[0.0, 0.0], [99.0, 1.0]]
+    assert history.lttb(times, values, 1) == [[99.0, 1.0]]
+
+
+def test_lttb_returns_at_most_points():
+    times, values = series(1000)
+    result = history.lttb(times, values, 50)
+    assert len(result) == 50
+    assert result[0] == [0.0, 0.0] and result[-1] == [999.0, 5.0]
@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import rates
+
+
+def test_first_reading_has_no_rate():
+    counters = rates.Rates()
+    assert counters.update({"eth0": 1000}, now=10.0) == {"eth0": None}
+
+
+def test_rate_divides_by_the_time_between_readings():
+    counters = rates.Rates()
+    counters.update({"eth0": 1000}, now=10.0)
+    # A late tick: 2.5s passed, not the nominal 1s
+    assert counters.update({"eth0": 6000}, now=12.5) == {"eth0": 2000.0}
+
+
+def test_counter_going_backwards_counts_up_from_zero():
+    counters = rates.Rates()
+    counters.update({"eth0": 50000}, now=10.0)
+    assert counters.update({"eth0": 300}, now=11.0) == {"eth0": 300.0}
+
+
+def test_new_and_dropped_keys():
+    counters = rates.Rates()
+    counters.update({"eth0": 100, "wlan0": 100}, now=10.0)
+    assert counters.update({"eth0": 200, "usb0": 5}, now=11.0) == {"eth0": 100.0, "usb0": None}
+    # wlan0 was dropped, so coming back it starts over
+    assert counters.update({"wlan0": 900}, now=12.0) == {"wlan0": None}
+
+
+def test_reading_at_the_same_time_has_no_rate():
+    counters = rates.Rates()
+    counters.update({"eth0": 100}, now=10.0)
+    assert counters.update({"eth0": 200}, now=10.0) == {"eth0": None}
@@ -0,0 +1,42 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import store
+
+RETENTION = {1: 86400, 60: 7 * 86400, 3600: 30 * 86400}  # Small files, same three levels
+START = 1_699_999_200.0  # On an hour boundary
+
+
+def filled(directory, seconds):
+    metrics = store.MetricStore(str(directory), ["cpu.percent"], RETENTION)
+    for second in range(seconds):
+        metrics.append(START + second, {"cpu.percent": float(second % 100)})
+    return metrics
+
+
+def test_window_longer_than_the_store_uses_the_finest_fitting_level(tmp_path):
+    metrics = filled(tmp_path, 2 * 3600)
+    end = START + 2 * 3600
+    resolution, times, _, _, _ = metrics.query("cpu.percent", end - 86400, end, step=86400 / 300)
+    assert resolution == 60
+    assert len(times) == 119  # Every closed minute, not two hours
+    metrics.close()
+
+
+def test_young_store_reaches_back_to_its_first_sample(tmp_path):
+    # The first minute bucket is labelled before the first sample
+    metrics = store.MetricStore(str(tmp_path), ["cpu.percent"], RETENTION)
+    for second in range(40, 90):
+        metrics.append(START + second, {"cpu.percent": 1.0})
+    assert metrics.levels[1].count == 1
+    assert metrics.oldest() == START + 40
+    assert metrics.levelFor(START + 60) == 1
+    metrics.close()
+
+
+def test_level_for_an_empty_store_is_the_raw_one(tmp_path):
+    metrics = store.MetricStore(str(tmp_path), ["cpu.percent"], RETENTION)
+    assert metrics.oldest() is None
+    assert metrics.levelFor(START, step=300) == 1
+    metrics.close()
@@ -0,0 +1,43 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import main
+
+UTC_MIDNIGHT = 1_760_745_600  # 2025-10-18 00:00 UTC
+
+
+def twoDays(midnight):
+    """A hand-built two-day forecast whose local days start at midnight (an epoch)."""
+    days = []
+    for day in range(2):
+        start = midnight + day * 86400
+        days.append({"date_epoch": start, "hour": [
+            {"time_epoch": start + hour * 3600, "temp_c": day * 100 + hour} for hour in range(24)
+        ]})
+    return {"forecast": {"forecastday": days}}
+
+
+def test_next_hour_at_23_30_is_tomorrows_midnight(monkeypatch):
+    monkeypatch.setattr(main, "weatherHours", main.indexHours(twoDays(UTC_MIDNIGHT)))
+    now = UTC_MIDNIGHT + 23 * 3600 + 1800
+    assert main.forecastAt(now)["temp_c"] == 23
+    assert main.forecastAt(now + 3600)["temp_c"] == 100
+
+
+def test_half_hour_time_zone(monkeypatch):
+    # +05:30: local midnight is 18:30 UTC the day before, every hour starts at :30 UTC
+    midnight = UTC_MIDNIGHT - 5 * 3600 - 1800
+    monkeypatch.setattr(main, "weatherHours", main.indexHours(twoDays(midnight)))
+    assert main.forecastAt(midnight + 10 * 3600)["temp_c"] == 10
+    assert main.forecastAt(midnight + 10 * 3600 + 3599)["temp_c"] == 10
+    assert main.forecastAt(midnight + 11 * 3600)["temp_c"] == 11
+    now = midnight + 23 * 3600 + 1800  # 23:30 local
+    assert main.forecastAt(now + 3600)["temp_c"] == 100
+
+
+def test_outside_the_forecast(monkeypatch):
+    monkeypatch.setattr(main, "weatherHours", main.indexHours(twoDays(UTC_MIDNIGHT)))
+    assert main.forecastAt(UTC_MIDNIGHT - 1) is None
+    assert main.forecastAt(UTC_MIDNIGHT + 2 * 86400) is None
+    assert main.indexHours({}) == (0, {})
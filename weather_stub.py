@@ -0,0 +1,171 @@
+"""Local stand-in for weatherapi.com's forecast endpoint, to run and benchmark the weather path offline.
+
+Serves /v1/forecast.json with a made-up forecast in the API's shape: today
+and the following days in this machine's time zone, hourly entries, current
+conditions and no alerts. The forecast only changes on the hour and carries
+an ETag, so conditional requests are answered with 304.
+
+Run it and point the dashboard at it:
+    python weather_stub.py [--port 5005] [--delay 0.5]
+    python main.py --weather-url http://localhost:5005/v1/forecast.json
+"""
+import argparse
+import hashlib
+import json
+import math
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FORECAST_PATH = "/v1/forecast.json"
+CONDITION = {"text": "Partly cloudy", "icon": "//cdn.weatherapi.com/weather/64x64/day/116.png", "code": 1003}
+
+stats = {"requests": 0, "notModified": 0}  # Served so far, read by benchmarks
+statsLock = threading.Lock()
+forecasts = {}  # (days, hour) -> (body, etag), one per hour the forecast is asked for
+
+
+def hourEntry(epoch):
+    """Weather of one hour, a smooth daily cycle with a little per-day variation."""
+    local = time.localtime(epoch)
+    phase = (local.tm_hour - 15) / 24 * 2 * math.pi  # Warmest around 15:00
+    temp = round(12 + 6 * math.cos(phase) + (local.tm_yday % 5) * 0.4, 1)
+    rain = (local.tm_yday + local.tm_hour) % 7 == 0
+    return {
+        "time_epoch": int(epoch),
+        "time": time.strftime("%Y-%m-%d %H:%M", local),
+        "temp_c": temp,
+        "temp_f": round(temp * 9 / 5 + 32, 1),
+        "is_day": int(7 <= local.tm_hour < 19),
+        "condition": CONDITION,
+        "wind_mph": round(6 + 3 * math.sin(phase), 1),
+        "wind_kph": round((6 + 3 * math.sin(phase)) * 1.609, 1),
+        "wind_dir": "WSW",
+        "pressure_mb": 1014.0,
+        "precip_mm": 0.4 if rain else 0.0,
+        "humidity": int(70 - 15 * math.cos(phase)),
+        "cloud": 75 if rain else 25,
+        "feelslike_c": round(temp - 1.1, 1),
+        "chance_of_rain": 70 if rain else 10,
+        "uv": max(0.0, round(5 * math.cos(phase), 1))
+    }
+
+
+def makeForecast(days, now):
+    """A forecast document for days days starting today."""
+    today = time.localtime(now)
+    forecastDays = []
+    for day in range(days):
+        # mktime rolls the day over into the next month and keeps daylight saving changes right
+        start = time.mktime((today.tm_year, today.tm_mon, today.tm_mday + day, 0, 0, 0, 0, 0, -1))
+        hours = [hourEntry(start + hour * 3600) for hour in range(24)]
+        temps = [hour["temp_c"] for hour in hours]
+        forecastDays.append({
+            "date": time.strftime("%Y-%m-%d", time.localtime(start)),
+            "date_epoch": int(start),
+            "day": {
+                "maxtemp_c": max(temps),
+                "mintemp_c": min(temps),
+                "avgtemp_c": round(sum(temps) / len(temps), 1),
+                "maxwind_mph": max(hour["wind_mph"] for hour in hours),
+                "totalprecip_mm": round(sum(hour["precip_mm"] for hour in hours), 1),
+                "avghumidity": sum(hour["humidity"] for hour in hours) // len(hours),
+                "daily_will_it_rain": int(any(hour["precip_mm"] for hour in hours)),
+                "daily_chance_of_rain": max(hour["chance_of_rain"] for hour in hours),
+                "condition": CONDITION,
+                "uv": max(hour["uv"] for hour in hours)
+            },
+            "astro": {"sunrise": "07:05 AM", "sunset": "06:20 PM"},
+            "hour": hours
+        })
+    current = hourEntry(now - now % 3600)
+    return {
+        "location": {
+            "name": "Localhost", "region": "", "country": "Stub", "lat": 0.0, "lon": 0.0,
+            "tz_id": time.strftime("%Z"), "localtime_epoch": int(now), "localtime": time.strftime("%Y-%m-%d %H:%M", time.localtime(now))
+        },
+        "current": {
+            "last_updated_epoch": current["time_epoch"],
+            **{key: current[key] for key in ("temp_c", "temp_f", "is_day", "condition", "wind_mph", "wind_kph", "wind_dir",
+                                             "pressure_mb", "precip_mm", "humidity", "cloud", "feelslike_c", "uv")}
+        },
+        "forecast": {"forecastday": forecastDays},
+        "alerts": {"alert": []}
+    }
+
+
+def forecastFor(days, now):
+    """Serialized forecast and its ETag, built once per hour."""
+    key = (days, int(now // 3600))
+    cached = forecasts.get(key)
+    if cached is None:
+        body = json.dumps(makeForecast(days, now)).encode()
+        cached = forecasts[key] = (body, '"' + hashlib.sha1(body).hexdigest()[:16] + '"')
+    return cached
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    delay = 0.0  # Seconds every answer is held back, to look like a slow network
+    quiet = False
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path != FORECAST_PATH:
+            self.send_error(404)
+            return
+        query = urllib.parse.parse_qs(url.query)
+        try:
+            days = max(1, min(14, int(query.get("days", ["2"])[0])))
+        except ValueError:
+            days = 2
+        if self.delay:
+            time.sleep(self.delay)
+        body, etag = forecastFor(days, time.time())
+        with statsLock:
+            stats["requests"] += 1
+            if self.headers.get("If-None-Match") == etag:
+                stats["notModified"] += 1
+                notModified = True
+            else:
+                notModified = False
+        if notModified:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def serve(port=0, delay=0.0, quiet=False):
+    """Start the stub on a daemon thread, returning the server (port 0 picks a free one)."""
+    handler = type("Handler", (StubHandler,), {"delay": delay, "quiet": quiet})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fake weatherapi.com forecasts locally.")
+    parser.add_argument("--port", type=int, default=5005, help="Port to listen on")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to hold back every answer")
+    args = parser.parse_args()
+    server = serve(args.port, args.delay)
+    print(f"Forecasts at http://localhost:{server.server_address[1]}{FORECAST_PATH}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Helpers shared by server.py and main.py for moving snapshots over the wire."""
+import json
+
+
+def makePatch(old, new):
+    """Build a JSON merge patch (RFC 7386) that turns old into new."""
+    patch = {}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            subPatch = makePatch(old[key], value)
+            if subPatch:
+                patch[key] = subPatch
+        elif old[key] != value:
+            patch[key] = value
+    for key in old:
+        if key not in new:
+            patch[key] = None
+    return patch
+
+
+def applyPatch(target, patch):
+    """Apply a JSON merge patch, returning a new document and leaving target untouched."""
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            # null removes the key, so None valued fields arrive as missing
+            result.pop(key, None)
+        else:
+            result[key] = applyPatch(result.get(key), value)
+    return result
+
+
+# Content negotiation. msgpack is optional on both sides, JSON is always available.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/x-msgpack"
+FORMATS = [MSGPACK, JSON] if msgpack else [JSON]
+ACCEPT = f"{MSGPACK}, {JSON};q=0.5" if msgpack else JSON  # What clients ask for
+
+
+def parseAccept(header):
+    """Parse an Accept style header into {value: q}."""
+    accepted = {}
+    for item in (header or "").split(","):
+        parts = item.strip().split(";")
+        q = 1.0
+        for param in parts[1:]:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if parts[0].strip():
+            accepted[parts[0].strip().lower()] = q
+    return accepted
+
+
+def negotiate(header, offered=FORMATS, default=JSON):
+    """Pick the best offered value from an Accept style header.
+
+    Ties go to whichever comes first in offered, so list the most compact first.
+    """
+    accepted = parseAccept(header)
+    best, bestQ = default, 0.0
+    for value in offered:
+        q = accepted.get(value, 0.0)
+        if q > bestQ:
+            best, bestQ = value, q
+    return best
+
+
+def encode(document, fmt):
+    """Serialize a document."""
+    if fmt == MSGPACK:
+        return msgpack.packb(document, use_bin_type=True)
+    return json.dumps(document, separators=(",", ":")).encode()
+
+
+def decode(body, fmt):
+    """Deserialize a document."""
+    if fmt == MSGPACK:
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body)
+
+
+# Stream framing. JSON streams are Server-Sent Events, msgpack streams are a
+# sequence of [event, id, data] arrays built around the already encoded body.
+def streamType(fmt):
+    """Content type of a stream in the given format."""
+    return MSGPACK if fmt == MSGPACK else "text/event-stream"
+
+
+def frame(event, seq, body, fmt):
+    """One stream message around an encoded body."""
+    if fmt == MSGPACK:
+        return b"\x93" + msgpack.packb(event) + msgpack.packb(seq) + body
+    return b"event: %s\nid: %d\ndata: %s\n\n" % (event.encode(), seq, body)
+
+
+def heartbeat(fmt):
+    """Keep-alive message for a quiet stream."""
+    if fmt == MSGPACK:
+        return b"\x93" + msgpack.packb("ping") + msgpack.packb(None) + msgpack.packb(None)
+    return b": ping\n\n"
+
+
+def readFrames(chunks, fmt):
+    """Yield (event, id, document) for each message in a stream of byte chunks.
+
+    Heartbeats are dropped, ids are returned as strings like SSE's Last-Event-ID.
+    """
+    if fmt == MSGPACK:
+        unpacker = msgpack.Unpacker(raw=False)
+        for chunk in chunks:
+            unpacker.feed(chunk)
+            for event, eventId, document in unpacker:
+                if event != "ping":
+                    yield event, str(eventId), document
+        return
+
+    event, eventId, data = "message", None, []
+    for line in iterLines(chunks):
+        if not line:
+            if data:
+                yield event, eventId, json.loads("\n".join(data))
+            event, eventId, data = "message", None, []
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip())
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("id:"):
+            eventId = line[3:].strip()
+        # Anything else (': ping' heartbeats, unknown fields) is ignored
+
+
+def followStream(session, url, lastId=None, document=None, **kwargs):
+    """Yield (id, document) for every snapshot on a server's /stream, applying patches.
+
+    document is the caller's copy as of lastId, so a resumed stream can start
+    with a patch. Extra keyword arguments go to session.get.
+    """
+    headers = {"Accept": ACCEPT}
+    if lastId:
+        headers["Last-Event-ID"] = lastId
+    with session.get(f"{url}/stream", headers=headers, stream=True, **kwargs) as response:
+        response.raise_for_status()
+        # Binary if the server agreed to it, otherwise Server-Sent Events
+        fmt = MSGPACK if response.headers.get("Content-Type", "").startswith(MSGPACK) else JSON
+        for event, eventId, data in readFrames(response.iter_content(chunk_size=None), fmt):
+            document = applyPatch(document, data) if event == "patch" else data
+            yield eventId, document
+
+
+def iterLines(chunks):
+    """Split byte chunks into decoded lines as soon as each line is complete."""
+    pending = b""
+    for chunk in chunks:
+        pending += chunk
+        *complete, pending = pending.split(b"\n")
+        for line in complete:
+            yield line.rstrip(b"\r").decode()
+    if pending:
+        yield pending.decode()